@@ -1,5 +1,8 @@
 import os
+import re
 import json
+import time
+from collections import deque
 import google.generativeai as genai
 from dotenv import load_dotenv
 
@@ -9,74 +12,144 @@ load_dotenv()
 MODEL_NAME = "models/gemini-2.5-flash"
 # -----------------------------------------------
 
+# Sent once as the system instruction instead of inside every prompt.
+# Keys match the compact payload built in _payload().
+SYSTEM_PROMPT = (
+    "You are a crypto trading algorithm. Input is JSON: sym=symbol, px=price USD, mc=market cap USD, "
+    "liq=liquidity USD, ch1h/ch24h=price change %, vol=24h volume USD, buys/sells=24h tx counts, rug=RugCheck risk score.\n"
+    "FAIL (AVOID) if: rug>55; liq<3000; vol<10000; sells>3*buys.\n"
+    "Otherwise:\n"
+    "A Dip Buy: ch1h<0 and ch24h>0 -> BUY.\n"
+    "B Momentum Buy: 0<=ch1h<=15 and high vol -> BUY.\n"
+    "C FOMO Trap: ch1h>30 -> AVOID (wait for cooldown).\n"
+    'Reply JSON only, verdict first: {"verdict":"BUY"|"AVOID","confidence":0-100,'
+    '"risk_level":"LOW"|"MEDIUM"|"HIGH","reasoning":"concise reason"}'
+)
+GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "temperature": 0.1
+}
+
+_VERDICT_RE = re.compile(r'"verdict"\s*:\s*"(\w+)"')
+
+
 class AIAnalyst:
     def __init__(self):
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
             print("❌ CRITICAL ERROR: GEMINI_API_KEY not found in .env file!")
-        
+
         genai.configure(api_key=api_key)
         print(f"🧠 AI Analyst initialized using model: {MODEL_NAME}")
-        
-        self.model = genai.GenerativeModel(
+
+        self.model = self._build_model()
+        self.stats = deque(maxlen=500) # per-call tokens and latency
+
+    def _build_model(self):
+        # The strategy prompt is below Gemini's explicit context-cache minimum, so it rides as the system instruction
+        return genai.GenerativeModel(
             MODEL_NAME,
-            generation_config={
-                "response_mime_type": "application/json",
-                "temperature": 0.1 
-            }
+            generation_config=GENERATION_CONFIG,
+            system_instruction=SYSTEM_PROMPT
         )
 
-    async def analyze_token(self, token_data, safety_data):
-        prompt = f"""
-        Act as a professional crypto trading algorithm.
-        
-        --- INPUT DATA ---
-        Token: {token_data.get('symbol')}
-        Price: ${token_data.get('price')}
-        Mcap: ${token_data.get('market_cap')}
-        Liq: ${token_data.get('liquidity')}
-        
-        Momentum (1h): {token_data.get('price_change_1h')}%
-        Momentum (24h): {token_data.get('price_change_24h')}%
-        
-        Volume: ${token_data.get('volume_24h')}
-        Buys: {token_data.get('buy_tx_count')}
-        Sells: {token_data.get('sell_tx_count')}
-        
-        RugCheck Score: {safety_data.get('score')}
-
-        --- STRATEGY RULES ---
-        1. FAIL if RugCheck > 55.
-        2. FAIL if Liquidity < $3,000.
-        3. FAIL if Volume < $10,000.
-        4. FAIL if Sells are > 3x Buys.
-        
-        --- ENTRY LOGIC (Choose A or B) ---
-        
-        Scenario A: "The Dip Buy"
-        - IF 1h Change is NEGATIVE (Pullback) AND 24h Change is POSITIVE (Uptrend).
-        - VERDICT: BUY.
-        
-        Scenario B: "The Momentum Buy"
-        - IF 1h Change is POSITIVE (0% to 15%) AND Volume is High.
-        - VERDICT: BUY (Riding the trend).
-        
-        Scenario C: "The FOMO Trap"
-        - IF 1h Change is > 30% (Pumped too hard).
-        - VERDICT: AVOID (Wait for cooldown).
-
-        Output JSON ONLY:
-        {{
-            "verdict": "BUY" or "AVOID",
-            "confidence": 0-100,
-            "risk_level": "LOW", "MEDIUM", or "HIGH",
-            "reasoning": "Concise reason."
-        }}
-        """
+    @staticmethod
+    def _payload(token_data, safety_data):
+        def num(value, digits=0):
+            try:
+                return round(float(value), digits) if digits else int(round(float(value)))
+            except (TypeError, ValueError):
+                return None
+
+        payload = {
+            "sym": token_data.get('symbol'),
+            "px": float(f"{num(token_data.get('price'), 12) or 0:.4g}"),
+            "mc": num(token_data.get('market_cap')),
+            "liq": num(token_data.get('liquidity')),
+            "ch1h": num(token_data.get('price_change_1h'), 1),
+            "ch24h": num(token_data.get('price_change_24h'), 1),
+            "vol": num(token_data.get('volume_24h')),
+            "buys": token_data.get('buy_tx_count'),
+            "sells": token_data.get('sell_tx_count'),
+            "rug": safety_data.get('score')
+        }
+        return json.dumps(payload, separators=(',', ':'))
+
+    async def analyze_token(self, token_data, safety_data, on_verdict=None, verdict_only=False):
+        """Streams the answer. on_verdict(verdict) is awaited as soon as the verdict field arrives.
+        verdict_only stops the stream right there and returns just {"verdict": ...}."""
+        prompt = self._payload(token_data, safety_data)
+        start = time.perf_counter()
+        verdict = None
+        verdict_ms = None
+        text = ""
 
         try:
-            response = await self.model.generate_content_async(prompt)
-            return json.loads(response.text)
+            response = await self.model.generate_content_async(prompt, stream=True)
+            async for chunk in response:
+                text += chunk.text
+                if verdict is None:
+                    match = _VERDICT_RE.search(text)
+                    if match:
+                        verdict = match.group(1)
+                        verdict_ms = (time.perf_counter() - start) * 1000
+                        if on_verdict:
+                            await self._notify(on_verdict, verdict)
+                        if verdict_only:
+                            break
+
+            if verdict_only and verdict:
+                result = {"verdict": verdict}
+            else:
+                result = json.loads(text)
+            self._record(token_data, prompt, response, start, verdict_ms)
+            return result
         except Exception as e:
             print(f"❌ AI Error ({MODEL_NAME}): {e}")
-            return {"verdict": "ERROR", "confidence": 0, "reasoning": "AI Unreachable"}
\ No newline at end of file
+            if verdict:
+                # the stream broke after the verdict, keep what we know
+                return {"verdict": verdict, "confidence": 0, "reasoning": "AI response cut off"}
+            return {"verdict": "ERROR", "confidence": 0, "reasoning": "AI Unreachable"}
+
+    @staticmethod
+    async def _notify(on_verdict, verdict):
+        # a failing callback (e.g. a Telegram edit) is not an AI failure, don't let it end the stream
+        try:
+            await on_verdict(verdict)
+        except Exception as e:
+            print(f"⚠️ Verdict callback error: {e}")
+
+    def _record(self, token_data, prompt, response, start, verdict_ms):
+        # Gemini puts usage on every chunk, so a stream stopped at the verdict still has its prompt count
+        try:
+            usage = response.usage_metadata
+        except Exception:
+            usage = None
+        entry = {
+            "symbol": token_data.get('symbol'),
+            "prompt_chars": len(prompt),
+            "prompt_tokens": getattr(usage, 'prompt_token_count', None),
+            "cached_tokens": getattr(usage, 'cached_content_token_count', None),
+            "output_tokens": getattr(usage, 'candidates_token_count', None),
+            "verdict_ms": round(verdict_ms, 1) if verdict_ms is not None else None,
+            "total_ms": round((time.perf_counter() - start) * 1000, 1),
+            "at": time.time()
+        }
+        self.stats.append(entry)
+        print(f"🧠 AI {entry['symbol']}: {entry['prompt_tokens']} in / {entry['output_tokens']} out tokens, "
+              f"verdict {entry['verdict_ms']}ms, total {entry['total_ms']}ms")
+
+    def get_stats(self):
+        """Averages over the recorded calls"""
+        def avg(key):
+            values = [s[key] for s in self.stats if s[key] is not None]
+            return round(sum(values) / len(values), 1) if values else None
+
+        return {
+            "calls": len(self.stats),
+            "avg_prompt_tokens": avg("prompt_tokens"),
+            "avg_cached_tokens": avg("cached_tokens"),
+            "avg_output_tokens": avg("output_tokens"),
+            "avg_verdict_ms": avg("verdict_ms"),
+            "avg_total_ms": avg("total_ms"),
+        }
@@ -1,15 +1,23 @@
 import asyncio
+import os
+import time
 import logging
 from solana.rpc.async_api import AsyncClient
 from solders.transaction import VersionedTransaction
 from solders.message import to_bytes_versioned
 import base64
+from exit_engine import ExitEngine, ExitOrder
+from confirmations import ConfirmationTracker
 
 #Settings
 BUY_AMOUNT_SOL = 0.02 
 TAKE_PROFIT_PCT= 30 #+30%
 STOP_LOSS_PCT = 15 #-15%
+PRICE_CHECK_INTERVAL = 5 #seconds between price checks on open positions
+HUNT_INTERVAL = 300 #longest wait between auto hunts, sooner when a source is due
+MIN_HUNT_INTERVAL = 10 #shortest wait, also when budget left a due source unpolled
 SOL_MINT= "So11111111111111111111111111111111111111112"
+RPC_URL = os.getenv("SOLANA_RPC_URL", "https://api.mainnet-beta.solana.com")
 
 class AutoTrader:
     def __init__(self, wallet, data_engine, hunter, tracker, bot_app):
@@ -20,35 +28,66 @@ class AutoTrader:
         self.bot = bot_app #Telegram app to send alerts
         self.is_running= False
         self.chat_id= None # we need to know where to send alerts
+        self.tasks= [] # hunting + management loops while running
+        self.rpc_url= RPC_URL
+        #swaps sent but not landed yet, polled in batches until they confirm, fail or expire
+        self.confirmations= ConfirmationTracker(self.on_swap_landed, self.on_swap_failed, self._send, self.rpc_url)
+        self.paper= None # PaperExchange, when set swaps are simulated (see paper.py)
+        #exit rules (stop loss, trailing stop, take-profit ladder) for every open position
+        self.exits= ExitEngine(TAKE_PROFIT_PCT, STOP_LOSS_PCT)
+        self.exits.load(self.tracker.get_open_positions())
 
     async def start(self, chat_id):
-        self.is_running = True
         self.chat_id= chat_id
+        if self.is_running:
+            return "ℹ️ **Auto-Trading is already running.**"
+        self.is_running = True
         #start both loops
-        asyncio.create_task(self.hunting_loop())
-        asyncio.create_task(self.management_loop())
+        self.tasks= [asyncio.create_task(self.hunting_loop()), asyncio.create_task(self.management_loop())]
         return "✅ **Auto-Trading Started!**\nI will scan for gems and manage positions."
 
     async def stop(self):
+        #cancel the loops right away, otherwise a quick /auto after /stopauto runs them twice
         self.is_running= False
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks= []
         return  "🛑 **Auto-Trading Stopped.**"
 
-    async def execute_swap(self, input_mint, output_mint, amount, is_buy=True):
-        #helper to execute a trade
+    async def execute_swap(self, input_mint, output_mint, amount, is_buy=True, info=None, raise_errors=False):
+        #helper to execute a trade, info (symbol, price, chat_id...) is kept with the pending swap.
+        #Returns the signature once sent, the trade is booked when the confirmation tracker sees it land.
+        #raise_errors lets a caller that talks to the user show why a send failed.
+        #shielded: a loop cancelled by stop() must not drop a swap between send and track
+        if self.paper:
+            return await asyncio.shield(self._paper_swap(input_mint, output_mint, amount, is_buy, info))
+        swap= {
+            "side": "BUY" if is_buy else "SELL",
+            "mint": output_mint if is_buy else input_mint,
+            "input_mint": input_mint,
+            "output_mint": output_mint,
+            "amount_in": int(amount),
+            **(info or {})
+        }
+        return await asyncio.shield(self._send(swap, raise_errors))
+
+    async def _send(self, swap, raise_errors=False):
+        #quote -> sign -> send, then hand the signature to the confirmation tracker
         try:
             #Get Transaction
-            swap_tx= await self.data.get_swap_transaction(
+            built= await self.data.get_swap(
                 self.wallet.get_public_key(),
-                input_mint,
-                output_mint,
-                int(amount)
+                swap['input_mint'],
+                swap['output_mint'],
+                swap['amount_in']
             )
-            if not swap_tx: 
+            if not built: 
                 return None
             
             #sign and send
-            rpc_client= AsyncClient("https://api.mainnet-beta.solana.com")
-            tx_bytes= base64.b64decode(swap_tx)
+            rpc_client= AsyncClient(self.rpc_url)
+            tx_bytes= base64.b64decode(built['tx'])
             tx = VersionedTransaction.from_bytes(tx_bytes)
 
             keypair= self.wallet.get_keypair()
@@ -58,7 +97,224 @@ class AutoTrader:
 
             result= await rpc_client.send_transaction(signed_tx)
             await rpc_client.close()
-            return str(result.value)
+            tx_sig= str(result.value)
+
+            self.confirmations.track(tx_sig, {
+                **swap,
+                "owner": str(keypair.pubkey()),
+                "expected_out": int(built['quote'].get('outAmount', 0)),
+                "tx": base64.b64encode(bytes(signed_tx)).decode(),
+                "last_valid_block_height": built.get('last_valid_block_height'),
+                "sent_at": time.time()
+            })
+            return tx_sig
         except Exception as e:
             logging.error(f"Swap Error: {e}")
-            return None
\ No newline at end of file
+            if raise_errors:
+                raise
+            return None
+
+    async def _paper_swap(self, input_mint, output_mint, amount, is_buy, info):
+        #simulated fill, lands right away
+        fill= await self.paper.swap(input_mint, output_mint, amount)
+        if not fill:
+            return None
+        swap= {
+            "side": "BUY" if is_buy else "SELL",
+            "mint": output_mint if is_buy else input_mint,
+            "amount_in": int(amount),
+            "expected_out": fill['out_amount'],
+            "sent_at": time.time(),
+            "price": fill['price'],
+            **(info or {})
+        }
+        await self.on_swap_landed(fill['signature'], swap, {"amount_in": int(amount), "amount_out": fill['out_amount'], "decimals": None})
+        return fill['signature']
+
+    async def hunting_loop(self):
+        #find gems, ask the AI, buy the ones it likes
+        while self.is_running:
+            try:
+                candidates= await self.hunter.find_candidates(skip_seen=True)
+                coins= await self.hunter.screen(candidates) if candidates else []
+                for coin in coins:
+                    mint= coin['data']['address']
+                    if mint in self.tracker.get_open_positions() or self.is_pending(mint):
+                        continue
+                    #only the verdict matters here, stop the stream as soon as it arrives
+                    analysis= await self.hunter.ai.analyze_token(coin['data'], coin['safety'], verdict_only=True)
+                    if analysis.get('verdict') != "BUY":
+                        continue
+                    #the alert goes out when it lands (on_swap_landed)
+                    await self.execute_swap(
+                        SOL_MINT, mint, BUY_AMOUNT_SOL * 1_000_000_000,
+                        info={"symbol": coin['data']['symbol'], "price": coin['data']['price']}
+                    )
+            except Exception as e:
+                logging.error(f"Hunting Loop Error: {e}")
+            #wake up when the next source is due, a fast productive source is polled at its own pace
+            wait= self.hunter.sources.next_due() - time.time()
+            await asyncio.sleep(min(HUNT_INTERVAL, max(MIN_HUNT_INTERVAL, wait)))
+
+    def is_pending(self, mint):
+        return self.confirmations.is_pending(mint)
+
+    async def on_swap_landed(self, tx_sig, swap, fill):
+        #a buy becomes a tracked position with exit rules, a sell closes (part of) one
+        if swap['side'] == "BUY":
+            await self._book_buy(tx_sig, swap, fill)
+        else:
+            await self._book_sell(tx_sig, swap, fill)
+
+    async def _book_buy(self, tx_sig, swap, fill):
+        mint= swap['mint']
+        amount_out= fill['amount_out']
+        price= swap.get('price') if self.paper else await self._fill_price(swap, fill)
+        if not price and self.data:
+            price= (await self.data.get_prices([mint])).get(mint, 0)
+        symbol= swap.get('symbol') or mint[:6]
+        #positions are keyed by mint: a second buy adds to the bag at the weighted-average entry
+        held= self.tracker.get_open_positions().get(mint)
+        amount= amount_out
+        entry= price or 0
+        if held and held.get('amount_tokens', 0) > 0:
+            symbol= held.get('symbol') or symbol
+            amount= held['amount_tokens'] + amount_out
+            if held.get('entry_price') and entry:
+                entry= (held['entry_price'] * held['amount_tokens'] + entry * amount_out) / amount
+            else:
+                entry= entry or held.get('entry_price', 0)
+        self.tracker.add_position(mint, symbol, entry, amount)
+        self.exits.add_position(mint, mint, entry, amount, symbol)
+        if self.paper and not swap.get('chat_id'):
+            return # no alert spam on simulated fills
+        await self.send_alert(
+            f"✅ **Buy Landed:** {symbol}\n"
+            f"• Got: {self._ui(amount_out, fill)} tokens for {swap['amount_in'] / 1_000_000_000:g} SOL\n"
+            f"• Entry: ${price or 0:.8g}\n"
+            + (f"• Added to position: {self._ui(amount, fill)} held, avg entry ${entry:.8g}\n" if amount != amount_out else "")
+            + self.tx_link(tx_sig),
+            swap.get('chat_id')
+        )
+
+    async def _fill_price(self, swap, fill):
+        #USD per token paid, from what actually moved (includes price impact and slippage)
+        if self.data and fill.get('decimals') is not None:
+            sol_usd= (await self.data.get_prices([SOL_MINT])).get(SOL_MINT)
+            if sol_usd:
+                tokens= fill['amount_out'] / 10 ** fill['decimals']
+                return fill['amount_in'] / 1_000_000_000 * sol_usd / tokens
+        #no SOL price: scale the signal price by how far the fill was from the quote
+        if swap.get('price') and swap.get('expected_out'):
+            return swap['price'] * swap['expected_out'] / fill['amount_out']
+        return swap.get('price')
+
+    async def _book_sell(self, tx_sig, swap, fill):
+        mint= swap['mint']
+        position= self.tracker.get_open_positions().get(mint)
+        if position:
+            remaining= position['amount_tokens'] - fill['amount_in']
+            exit_pos= self.exits.positions.get(mint)
+            if remaining > 0 and exit_pos:
+                #partial take-profit, keep the rest open
+                position["amount_tokens"]= remaining
+                exit_pos.amount= min(exit_pos.amount, remaining)
+                self.tracker.save_positions()
+            else:
+                self.tracker.remove_position(mint)
+                if exit_pos:
+                    self.exits.remove_position(mint)
+
+        order= swap.get('order') or {}
+        pnl= (order['price'] / order['entry'] - 1) * 100 if order.get('entry') else 0
+        await self.send_alert(
+            f"💸 **{order.get('reason', 'SELL').replace('_', ' ').title()}:** {swap.get('symbol') or mint}\n"
+            f"• Sold: {self._ui(fill['amount_in'], fill)} tokens for {fill['amount_out'] / 1_000_000_000:.4f} SOL\n"
+            f"• PnL: {pnl:+.1f}%\n"
+            + self.tx_link(tx_sig),
+            swap.get('chat_id')
+        )
+
+    async def on_swap_failed(self, tx_sig, swap, reason):
+        if swap['side'] == "SELL" and swap.get('order'):
+            #give the tokens back to the exit engine so the next price tick retries
+            self.exits.restore(ExitOrder(**swap['order']))
+        icon= "⌛" if reason == "expired" else "❌"
+        await self.send_alert(
+            f"{icon} **{swap['side'].title()} {reason}:** {swap.get('symbol') or swap['mint']} never landed."
+            + (" Will retry on the next price check." if swap['side'] == "SELL" else ""),
+            swap.get('chat_id')
+        )
+
+    @staticmethod
+    def _ui(amount, fill):
+        decimals= fill.get('decimals')
+        return f"{amount / 10 ** decimals:,.2f}" if decimals is not None else f"{amount:,}"
+
+    def checkpoint_state(self):
+        return {
+            "is_running": self.is_running,
+            "chat_id": self.chat_id,
+            "pending": self.confirmations.pending,
+            "exits": self.exits.checkpoint_state()
+        }
+
+    async def restore_state(self, state):
+        self.chat_id= state.get("chat_id")
+        self.confirmations.pending.update(state.get("pending", {}))
+        for swap in self.confirmations.pending.values():
+            swap.setdefault("owner", self.wallet.get_public_key()) # saved before fills were parsed
+        self.exits.restore_state(state.get("exits"))
+        for swap in self.confirmations.pending.values():
+            #the tracker still holds tokens of sells sent before the restart, don't sell them again
+            if swap['side'] == "SELL":
+                order= swap.get('order') or {}
+                self.exits.reserve(order.get('position_id', swap['mint']), order.get('amount', swap['amount_in']))
+        try:
+            #swaps sent before the restart may have landed long ago, search the full history once
+            await self.confirmations.poll(search_history=True)
+        except Exception as e:
+            logging.error(f"Reconcile Error: {e}")
+        if state.get("is_running") and self.chat_id:
+            await self.start(self.chat_id)
+            await self.send_alert(
+                f"♻️ **Bot restarted, auto-trading resumed.**\n"
+                f"• Open positions: {len(self.exits.positions)}\n"
+                f"• Swaps still pending: {len(self.confirmations.pending)}"
+            )
+
+    async def management_loop(self):
+        #watch prices of open positions and sell when an exit rule triggers
+        while self.is_running:
+            try:
+                #a mint with a sell in flight waits until it lands or fails
+                mints= [m for m in self.exits.mints() if not self.confirmations.is_pending(m, "SELL")]
+                if mints:
+                    prices= await self.data.get_prices(mints)
+                    orders= self.exits.on_prices(prices)
+                    if orders:
+                        await self.exits.execute(orders, self.sell_position)
+            except Exception as e:
+                logging.error(f"Management Loop Error: {e}")
+            await asyncio.sleep(PRICE_CHECK_INTERVAL)
+
+    async def sell_position(self, order):
+        #sell tokens back to SOL for one exit order, booked in _book_sell once it lands
+        return await self.execute_swap(
+            order.mint, SOL_MINT, order.amount, is_buy=False,
+            info={"symbol": order.symbol, "order": order._asdict()}
+        )
+
+    def tx_link(self, tx_sig):
+        if self.paper:
+            return f"📝 Paper trade `{tx_sig}` (simulated)"
+        return f"🔗 [View on Solscan](https://solscan.io/tx/{tx_sig})"
+
+    async def send_alert(self, text, chat_id=None):
+        chat_id= chat_id or self.chat_id
+        if not chat_id:
+            return
+        try:
+            await self.bot.bot.send_message(chat_id=chat_id, text=text, parse_mode="Markdown", disable_web_page_preview=True)
+        except Exception as e:
+            logging.error(f"Alert Error: {e}")
@@ -0,0 +1,289 @@
+#Benchmark / load test against mock_upstream.py, no live APIs needed.
+#   python benchmark.py                      -> run all scenarios, compare with bench_baseline.json
+#   python benchmark.py --save-baseline      -> store this run as the new baseline
+#   python benchmark.py --latency 80 --error-rate 0.05 --concurrency 50
+#   python benchmark.py --record fixtures.json --mints <CA> <CA>   -> record live responses once
+#   bench_fixtures.json (a few recorded tokens) is replayed by default, --fixtures none for synthetic tokens
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+from mock_upstream import MockUpstream, load_fixtures, record_fixtures, synthetic_fixtures, SOL_MINT
+
+BASELINE_FILE = "bench_baseline.json"
+FIXTURES_FILE = "bench_fixtures.json" # replayed by default when present
+CONFIRM_MAX_POLLS = 50
+SCENARIOS = ("token_data", "safety", "token_report", "ai_analyst", "analyze_token_logic", "hunt", "swap", "confirm")
+AI_REPLY = '{"verdict": "BUY", "confidence": 70, "risk_level": "MEDIUM", "reasoning": "Benchmark stub."}'
+
+
+class StubModel:
+    """Stands in for the Gemini model: fixed delay, fixed JSON answer streamed in a few chunks"""
+    def __init__(self, delay, chunks=4):
+        self.delay = delay
+        self.chunks = chunks
+
+    async def generate_content_async(self, prompt, stream=False, **kwargs):
+        usage = SimpleNamespace(prompt_token_count=len(prompt) // 4, cached_content_token_count=0,
+                                candidates_token_count=len(AI_REPLY) // 4)
+        if not stream:
+            await asyncio.sleep(self.delay)
+            return SimpleNamespace(text=AI_REPLY, usage_metadata=usage)
+        return StubStream(AI_REPLY, self.delay, self.chunks, usage)
+
+
+class StubStream:
+    def __init__(self, text, delay, chunks, usage):
+        size = -(-len(text) // chunks)
+        self.parts = [text[i:i + size] for i in range(0, len(text), size)]
+        self.delay = delay / len(self.parts)
+        self.usage_metadata = usage
+
+    async def __aiter__(self):
+        for part in self.parts:
+            await asyncio.sleep(self.delay)
+            yield SimpleNamespace(text=part)
+
+
+class StubBot:
+    """Just enough of telegram's Bot for analyze_token_logic"""
+    async def send_message(self, chat_id, text, **kwargs):
+        return SimpleNamespace(message_id=1)
+
+    async def edit_message_text(self, text, chat_id=None, message_id=None, **kwargs):
+        return True
+
+
+class BenchWallet:
+    def __init__(self):
+        from solders.keypair import Keypair
+        self.keypair = Keypair()
+
+    def get_public_key(self):
+        return str(self.keypair.pubkey())
+
+    def get_keypair(self):
+        return self.keypair
+
+
+async def run_load(fn, items, concurrency):
+    """Calls fn(item) for every item with at most `concurrency` in flight"""
+    latencies = []
+    failures = 0
+    queue = list(reversed(items))
+
+    async def worker():
+        nonlocal failures
+        while queue:
+            item = queue.pop()
+            start = time.perf_counter()
+            try:
+                ok = await fn(item)
+            except Exception:
+                ok = False
+            latencies.append(time.perf_counter() - start)
+            if not ok:
+                failures += 1
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(items)) or 1)))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000 if latencies else 0
+    return {
+        "calls": len(items),
+        "errors": failures,
+        "throughput": round(len(items) / elapsed, 2) if elapsed else 0,
+        "p50_ms": round(pct(50), 2),
+        "p95_ms": round(pct(95), 2),
+        "p99_ms": round(pct(99), 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0,
+        "peak_mem_kb": round(peak / 1024, 1),
+    }
+
+
+async def build_scenarios(mock, args, workdir):
+    from data_engine import DataEngine
+    from ai_analyst import AIAnalyst
+    from hunter import Hunter
+
+    engine = mock.patch_data_engine(DataEngine())
+    engine.safety.filename = os.path.join(workdir, "safety.json")
+    analyst = AIAnalyst()
+    analyst.model = StubModel(args.ai_latency / 1000)
+    mints = mock.mint_list
+
+    async def token_data(mint):
+        return await engine.get_token_data(mint) is not None
+
+    async def safety(mint):
+        engine.safety.results.pop(mint, None) # always measure the cold path
+        return (await engine.check_safety(mint))["score"] != "Unknown"
+
+    async def token_report(mint):
+        engine.safety.results.pop(mint, None)
+        token, _ = await engine.get_token_report(mint)
+        return token is not None
+
+    sample = await engine.get_token_data(mints[0]) or {}
+    async def ai_analyst(mint):
+        return (await analyst.analyze_token(sample, {"score": 10}))["verdict"] != "ERROR"
+
+    async def hunt(_):
+        hunter = mock.patch_hunter(Hunter(analyst, engine))
+        return "Gem Report" in await hunter.hunt()
+
+    scenarios = {"token_data": token_data, "safety": safety, "token_report": token_report,
+                 "ai_analyst": ai_analyst, "hunt": hunt}
+
+    if "analyze_token_logic" in args.scenarios:
+        import main
+        logging.getLogger().setLevel(logging.WARNING) # main.py turns on INFO logs for every request
+        main.data_engine = engine
+        main.ai_brain = analyst
+        context = SimpleNamespace(bot=StubBot())
+        async def analyze_token_logic(mint):
+            await main.analyze_token_logic(1, mint, context)
+            return True
+        scenarios["analyze_token_logic"] = analyze_token_logic
+
+    if "swap" in args.scenarios:
+        from auto_engine import AutoTrader
+        from tracker import TradeTracker
+        trader = AutoTrader(BenchWallet(), engine, None, TradeTracker(os.path.join(workdir, "positions.json")), None)
+        trader.rpc_url = trader.confirmations.rpc_url = mock.url
+        async def swap(mint):
+            return await trader.execute_swap(SOL_MINT, mint, 20_000_000) is not None
+        scenarios["swap"] = swap
+
+    if "confirm" in args.scenarios:
+        # send -> landed, all in-flight swaps share the tracker's batched status polls
+        from auto_engine import AutoTrader
+        from tracker import TradeTracker
+        confirmer = AutoTrader(BenchWallet(), engine, None, TradeTracker(os.path.join(workdir, "confirmed.json")), None)
+        confirmer.rpc_url = confirmer.confirmations.rpc_url = mock.url
+        async def confirm(mint):
+            tx_sig = await confirmer.execute_swap(SOL_MINT, mint, 20_000_000)
+            if tx_sig is None:
+                return False
+            # like ConfirmationTracker.run: a failed poll (RPC 500) is retried, it doesn't lose the swap
+            for _ in range(CONFIRM_MAX_POLLS):
+                if tx_sig not in confirmer.confirmations.pending:
+                    break
+                try:
+                    await confirmer.confirmations.poll()
+                except Exception:
+                    await asyncio.sleep(0.01)
+            return mint in confirmer.tracker.get_open_positions()
+        scenarios["confirm"] = confirm
+
+    return scenarios
+
+
+def compare(results, baseline, tolerance):
+    """Returns a list of human readable regressions vs the baseline"""
+    regressions = []
+    for name, now in results.items():
+        base = baseline.get(name)
+        if not base: continue
+        if now["throughput"] < base["throughput"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {now['throughput']}/s vs {base['throughput']}/s")
+        for key in ("p95_ms", "p99_ms", "peak_mem_kb"):
+            if base[key] and now[key] > base[key] * (1 + tolerance):
+                regressions.append(f"{name}: {key} {now[key]} vs {base[key]}")
+        if now["errors"] > base["errors"] * (1 + tolerance) + 1:
+            regressions.append(f"{name}: errors {now['errors']} vs {base['errors']}")
+    return regressions
+
+
+def print_table(results):
+    print(f"\n{'scenario':<22}{'calls':>7}{'err':>6}{'ops/s':>10}{'p50ms':>9}{'p95ms':>9}{'p99ms':>9}{'memKB':>10}")
+    for name, r in results.items():
+        print(f"{name:<22}{r['calls']:>7}{r['errors']:>6}{r['throughput']:>10}{r['p50_ms']:>9}"
+              f"{r['p95_ms']:>9}{r['p99_ms']:>9}{r['peak_mem_kb']:>10}")
+
+
+async def main_async(args):
+    if args.record:
+        await record_fixtures(args.record, args.mints)
+        return 0
+
+    use_fixtures = args.fixtures and args.fixtures != "none"
+    fixtures = load_fixtures(args.fixtures) if use_fixtures else synthetic_fixtures(args.tokens)
+    mock = MockUpstream(fixtures, latency=args.latency / 1000, jitter=args.jitter / 1000, error_rate=args.error_rate)
+    await mock.start()
+    workdir = tempfile.mkdtemp()
+    results = {}
+    try:
+        scenarios = await build_scenarios(mock, args, workdir)
+        mints = mock.mint_list
+        for name in args.scenarios:
+            calls = args.hunt_calls if name == "hunt" else args.calls
+            items = [mints[i % len(mints)] for i in range(calls)]
+            print(f"⏱️ {name}: {calls} calls @ concurrency {args.concurrency}...")
+            results[name] = await run_load(scenarios[name], items, args.concurrency)
+    finally:
+        await mock.stop()
+
+    print_table(results)
+    print(f"\n📡 Upstream requests: {mock.requests} | injected errors: {mock.errors}")
+
+    settings = {k: getattr(args, k) for k in ("calls", "concurrency", "latency", "jitter", "error_rate", "ai_latency", "fixtures")}
+    settings["tokens"] = len(mock.mint_list)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({"settings": settings, "results": results}, f, indent=4)
+        print(f"💾 Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("ℹ️ No baseline yet, run with --save-baseline")
+        return 0
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    if baseline.get("settings") != settings:
+        print(f"⚠️ Baseline was recorded with different settings: {baseline.get('settings')}")
+    regressions = compare(results, baseline.get("results", {}), args.tolerance)
+    if regressions:
+        print("❌ Regressions:\n" + "\n".join(f"• {r}" for r in regressions))
+        return 1
+    print("✅ No regressions vs baseline")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Trader bot benchmark against local mock upstreams")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--calls", type=int, default=200, help="calls per scenario")
+    parser.add_argument("--hunt-calls", type=int, default=10, help="calls for the hunt scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--tokens", type=int, default=50, help="fake tokens when no --fixtures")
+    parser.add_argument("--latency", type=float, default=20, help="upstream latency in ms")
+    parser.add_argument("--jitter", type=float, default=10, help="extra random latency in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of upstream calls that return 500")
+    parser.add_argument("--ai-latency", type=float, default=200, help="stub Gemini latency in ms")
+    parser.add_argument("--fixtures", default=FIXTURES_FILE if os.path.exists(FIXTURES_FILE) else None,
+                        help="recorded fixtures JSON to replay, 'none' for synthetic tokens")
+    parser.add_argument("--record", help="record live responses to this file and exit")
+    parser.add_argument("--mints", nargs="*", default=[], help="mints to record")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression, 0.2 = 20%%")
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main_async(parse_args())))
@@ -0,0 +1,86 @@
+#Saves runtime state (loops, pending swaps, discovery cursors...) so a restart picks up where we left off
+import asyncio
+import gzip
+import json
+import logging
+import os
+import time
+
+#Settings
+CHECKPOINT_INTERVAL = 30 #seconds between snapshots
+CHECKPOINT_FILE = "checkpoint.json.gz"
+
+
+class Checkpointer:
+    """Components register with a name and provide:
+       checkpoint_state() -> JSON-able dict
+       async restore_state(state)"""
+
+    def __init__(self, filename=CHECKPOINT_FILE):
+        self.filename = filename
+        self.components = {}
+        self.hooks = [] # called on every save, for components that keep their own files
+
+    def register(self, name, component):
+        self.components[name] = component
+
+    def add_hook(self, fn):
+        self.hooks.append(fn)
+
+    def save(self):
+        for hook in self.hooks:
+            try:
+                hook()
+            except Exception as e:
+                logging.error(f"Checkpoint Hook Error: {e}")
+
+        state = {"saved_at": time.time()}
+        for name, component in self.components.items():
+            try:
+                state[name] = component.checkpoint_state()
+            except Exception as e:
+                logging.error(f"Checkpoint Error ({name}): {e}")
+
+        # write to a temp file first so a crash mid-write never leaves a broken checkpoint
+        tmp = self.filename + ".tmp"
+        with gzip.open(tmp, 'wt', encoding='utf-8') as f:
+            json.dump(state, f, separators=(',', ':'))
+        os.replace(tmp, self.filename)
+
+    def load(self):
+        if not os.path.exists(self.filename):
+            return {}
+        try:
+            with gzip.open(self.filename, 'rt', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logging.error(f"Could not read checkpoint: {e}")
+            return {}
+
+    async def restore(self):
+        """Hands every component its saved state, all at once"""
+        state = self.load()
+        if not state:
+            print("ℹ️ No checkpoint found, cold start.")
+            return False
+
+        names = [name for name in self.components if name in state]
+        results = await asyncio.gather(
+            *(self.components[name].restore_state(state[name]) for name in names),
+            return_exceptions=True
+        )
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                logging.error(f"Restore Error ({name}): {result}")
+
+        age = time.time() - state.get("saved_at", time.time())
+        print(f"♻️ Restored {', '.join(names) or 'nothing'} from checkpoint ({age:.0f}s old)")
+        return True
+
+    async def run(self, interval=CHECKPOINT_INTERVAL):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.save()
+            except Exception as e:
+                logging.error(f"Checkpoint Error: {e}")
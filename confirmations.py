@@ -0,0 +1,200 @@
+#Follows every sent swap until it lands: batched status polls, rebroadcasts while the blockhash is valid,
+#a fresh swap once it expires, and the real amounts read back from the confirmed transaction.
+import asyncio
+import logging
+import os
+import time
+import aiohttp
+
+#Settings
+SOLANA_RPC_URL = os.getenv("SOLANA_RPC_URL", "https://api.mainnet-beta.solana.com")
+POLL_INTERVAL = 2 #seconds between status polls
+STATUS_BATCH = 256 #max signatures per getSignatureStatuses call
+REBROADCAST_INTERVAL = 4 #resend the same signed tx this often while its blockhash is valid
+MAX_RESUBMITS = 2 #fresh swaps built after a blockhash expires
+MAX_FETCH_TRIES = 5 #confirmed but getTransaction keeps returning nothing -> fall back to the quote
+PENDING_TIMEOUT = 90 #only used when the blockhash expiry is unknown
+
+
+class ConfirmationTracker:
+    """Pending swaps are dicts with side, mint, owner, amount_in, expected_out, sent_at and, for real sends,
+       tx (signed, base64) + last_valid_block_height.
+    on_landed(tx_sig, swap, fill)   fill = {"amount_in", "amount_out", "decimals"} from the confirmed tx
+    on_failed(tx_sig, swap, reason)
+    resubmit(swap) -> new signature (already tracked) or None, called once the blockhash has expired"""
+
+    def __init__(self, on_landed, on_failed, resubmit=None, rpc_url=SOLANA_RPC_URL):
+        self.on_landed = on_landed
+        self.on_failed = on_failed
+        self.resubmit = resubmit
+        self.rpc_url = rpc_url
+        self.pending = {} # signature -> swap
+        self._settling = set() # landed, being booked: still pending so nobody buys the mint twice
+
+    def track(self, tx_sig, swap):
+        swap.setdefault("sent_at", time.time())
+        self.pending[tx_sig] = swap
+
+    def is_pending(self, mint, side=None):
+        return any(p['mint'] == mint and side in (None, p['side']) for p in self.pending.values())
+
+    async def run(self, interval=POLL_INTERVAL):
+        while True:
+            try:
+                await self.poll()
+            except Exception as e:
+                logging.error(f"Confirmation Error: {e}")
+            await asyncio.sleep(interval)
+
+    async def poll(self, search_history=False):
+        """One round over everything pending. search_history=True also finds old signatures (after a restart)."""
+        if not self.pending:
+            return
+        sigs = list(self.pending)
+        async with aiohttp.ClientSession() as session:
+            statuses = await self._statuses(session, sigs, search_history)
+            block_height = await self._rpc(session, "getBlockHeight", [{"commitment": "confirmed"}])
+            now = time.time()
+
+            landed, unseen = [], []
+            for tx_sig, status in zip(sigs, statuses):
+                swap = self.pending.get(tx_sig)
+                if swap is None or tx_sig in self._settling:
+                    continue
+                if status is None:
+                    unseen.append(tx_sig)
+                elif status.get('err') is not None:
+                    del self.pending[tx_sig]
+                    await self.on_failed(tx_sig, swap, f"failed ({status['err']})")
+                elif status.get('confirmationStatus') in ("confirmed", "finalized"):
+                    landed.append(tx_sig)
+                # "processed" -> could still be dropped, check again next round
+
+            expired = []
+            for tx_sig in unseen:
+                if self._is_expired(self.pending[tx_sig], block_height, now):
+                    expired.append(tx_sig)
+                else:
+                    await self._rebroadcast(session, tx_sig, now)
+            if expired and not search_history:
+                # the recent status cache is short, make sure an expired one didn't land unnoticed
+                for tx_sig, status in zip(expired, await self._statuses(session, expired, True)):
+                    if status and status.get('err') is None:
+                        landed.append(tx_sig)
+                expired = [s for s in expired if s not in landed]
+
+            txs = await asyncio.gather(*(self._get_transaction(session, s) for s in landed), return_exceptions=True)
+
+        for tx_sig in expired:
+            await self._expire(tx_sig)
+        for tx_sig, tx in zip(landed, txs):
+            await self._land(tx_sig, None if isinstance(tx, Exception) else tx)
+
+    # ---------------- STATES ----------------
+    @staticmethod
+    def _is_expired(swap, block_height, now):
+        last_valid = swap.get('last_valid_block_height')
+        if last_valid and block_height:
+            return block_height > last_valid
+        return now - swap['sent_at'] > PENDING_TIMEOUT
+
+    async def _rebroadcast(self, session, tx_sig, now):
+        #the same signed tx can only land once, resending just gives it more chances to reach a leader
+        swap = self.pending[tx_sig]
+        if not swap.get('tx') or now - swap.get('broadcast_at', swap['sent_at']) < REBROADCAST_INTERVAL:
+            return
+        swap['broadcast_at'] = now
+        try:
+            await self._rpc(session, "sendTransaction", [swap['tx'], {"encoding": "base64", "skipPreflight": True, "maxRetries": 0}])
+        except Exception as e:
+            logging.error(f"Rebroadcast Error ({tx_sig}): {e}")
+
+    async def _expire(self, tx_sig):
+        #its blockhash is gone, this signature can never land: build a fresh swap or give up
+        swap = self.pending.pop(tx_sig, None)
+        if swap is None:
+            return # settled by an overlapping poll
+        if self.resubmit and swap.get('resubmits', 0) < MAX_RESUBMITS:
+            retry = {k: v for k, v in swap.items() if k not in ("tx", "last_valid_block_height", "sent_at", "broadcast_at")}
+            retry['resubmits'] = swap.get('resubmits', 0) + 1
+            new_sig = await self.resubmit(retry)
+            if new_sig:
+                print(f"🔁 Resubmitted {swap['side']} {swap.get('symbol', swap['mint'])}: {tx_sig} -> {new_sig}")
+                return
+        await self.on_failed(tx_sig, swap, "expired")
+
+    async def _land(self, tx_sig, tx):
+        swap = self.pending.get(tx_sig)
+        if swap is None or tx_sig in self._settling:
+            return
+        fill = self.parse_fill(tx, swap) if tx else None
+        if fill is None:
+            swap['fetch_tries'] = swap.get('fetch_tries', 0) + 1
+            if swap['fetch_tries'] < MAX_FETCH_TRIES:
+                return # RPC hasn't indexed it yet, next round
+            fill = {"amount_in": swap['amount_in'], "amount_out": swap['expected_out'], "decimals": None}
+        self._settling.add(tx_sig)
+        try:
+            await self.on_landed(tx_sig, swap, fill)
+        finally:
+            self._settling.discard(tx_sig)
+            self.pending.pop(tx_sig, None)
+
+    @staticmethod
+    def parse_fill(tx, swap):
+        """Amounts that actually moved for the wallet, from a jsonParsed transaction.
+        Buys are exact-in (SOL in = amount_in), sells report the SOL received before the network fee."""
+        meta = tx.get('meta') or {}
+        owner, mint = swap.get('owner'), swap['mint']
+        decimals = None
+
+        def tokens(key):
+            nonlocal decimals
+            total = 0
+            for balance in meta.get(key) or []:
+                if balance.get('owner') == owner and balance.get('mint') == mint:
+                    total += int(balance['uiTokenAmount']['amount'])
+                    decimals = balance['uiTokenAmount'].get('decimals')
+            return total
+
+        token_change = tokens('postTokenBalances') - tokens('preTokenBalances')
+        keys = [k['pubkey'] if isinstance(k, dict) else k for k in tx['transaction']['message']['accountKeys']]
+        if owner not in keys:
+            return None
+        i = keys.index(owner)
+        lamport_change = meta['postBalances'][i] - meta['preBalances'][i]
+        if i == 0:
+            lamport_change += meta.get('fee', 0) # fee payer
+
+        if swap['side'] == "BUY":
+            if token_change <= 0: return None
+            return {"amount_in": swap['amount_in'], "amount_out": token_change, "decimals": decimals}
+        if token_change >= 0: return None
+        return {"amount_in": -token_change, "amount_out": lamport_change, "decimals": decimals}
+
+    # ---------------- RPC ----------------
+    async def _statuses(self, session, sigs, search_history):
+        batches = [sigs[i:i + STATUS_BATCH] for i in range(0, len(sigs), STATUS_BATCH)]
+        results = await asyncio.gather(*(
+            self._rpc(session, "getSignatureStatuses", [batch, {"searchTransactionHistory": search_history}])
+            for batch in batches
+        ))
+        statuses = []
+        for batch, result in zip(batches, results):
+            statuses.extend((result or {}).get('value') or [None] * len(batch))
+        return statuses
+
+    async def _get_transaction(self, session, tx_sig):
+        return await self._rpc(session, "getTransaction", [tx_sig, {
+            "encoding": "jsonParsed", "commitment": "confirmed", "maxSupportedTransactionVersion": 0
+        }])
+
+    async def _rpc(self, session, method, params):
+        payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+        async with session.post(self.rpc_url, json=payload) as response:
+            if response.status != 200:
+                raise RuntimeError(f"{method} returned {response.status}")
+            data = await response.json()
+            if 'error' in data:
+                raise RuntimeError(f"{method}: {data['error'].get('message')}")
+            return data.get('result')
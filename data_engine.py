@@ -1,6 +1,12 @@
 import aiohttp
+import asyncio
 import time
 import socket
+from safety import SafetyChecker
+
+#Settings
+SNAPSHOT_BATCH = 30 # DexScreener max addresses per call
+MAX_PARALLEL_BATCHES = 4 # DexScreener rate limits bursts, keep a few calls in flight
 
 class DataEngine:
     def __init__(self):
@@ -8,6 +14,7 @@ class DataEngine:
         self.rugcheck_api = "https://api.rugcheck.xyz/v1/tokens/"
         self.jupiter_quote_api = "https://public.jupiterapi.com/quote"
         self.jupiter_swap_api = "https://public.jupiterapi.com/swap"
+        self.safety = SafetyChecker(rugcheck_api=self.rugcheck_api)
 
     async def get_token_data(self, token_address):
         """Fetches data and SUMS liquidity across all pairs"""
@@ -73,35 +80,122 @@ class DataEngine:
                         
                         "price_change_1h": float(price_change.get('h1', 0)),
                         "price_change_24h": float(price_change.get('h24', 0)),
-                        "top_10_percentage": 0 
+                        # Filled from the saved safety scan when we have one (see get_token_report)
+                        "top_10_percentage": (self.safety.get_cached(token_address) or {}).get('top_10_percentage', 0)
                     }
                     
         except Exception as e:
             print(f"❌ Error in get_token_data: {e}")
             return None
 
-    # ... (Keep check_safety and get_swap_transaction exactly the same) ...
-    async def check_safety(self, token_address):
+    async def get_prices(self, token_addresses):
+        """Fetches USD prices for many tokens, 30 per DexScreener call"""
+        snapshots = await self.get_snapshots(token_addresses)
+        return {mint: snap['price'] for mint, snap in snapshots.items() if snap['price'] > 0}
+
+    async def get_snapshots(self, token_addresses):
+        """Price, liquidity, volume and mcap for many tokens, 30 per DexScreener call, a few calls at a time.
+        Liquidity/volume are summed across Solana pairs like get_token_data."""
+        snapshots = {}
+        addresses = list(dict.fromkeys(token_addresses))
+        if not addresses: return snapshots
+
         conn = aiohttp.TCPConnector(family=socket.AF_INET, ssl=False)
         try:
             async with aiohttp.ClientSession(connector=conn) as session:
-                async with session.get(f"{self.rugcheck_api}{token_address}/report") as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        score = data.get('score', 0)
-                        risks = [risk['name'] for risk in data.get('risks', [])]
-                        return {"score": score, "risks": risks}
+                batches = [addresses[i:i + SNAPSHOT_BATCH] for i in range(0, len(addresses), SNAPSHOT_BATCH)]
+                limit = asyncio.Semaphore(MAX_PARALLEL_BATCHES)
+
+                async def fetch(batch):
+                    async with limit:
+                        return await self._fetch_snapshot_batch(session, batch)
+
+                results = await asyncio.gather(*(fetch(batch) for batch in batches), return_exceptions=True)
+                failed = 0
+                for batch, result in zip(batches, results):
+                    if isinstance(result, Exception):
+                        failed += len(batch)
+                        print(f"⚠️ Snapshot batch failed ({len(batch)} tokens): {result}")
+                    else:
+                        snapshots.update(result)
+                if failed:
+                    print(f"⚠️ get_snapshots: no data for {failed}/{len(addresses)} tokens this round")
+        except Exception as e:
+            print(f"❌ Error in get_snapshots: {e}")
+        return snapshots
+
+    async def _fetch_snapshot_batch(self, session, batch):
+        async with session.get(self.dex_api + ",".join(batch)) as response:
+            if response.status != 200:
+                raise RuntimeError(f"DexScreener returned {response.status}")
+            data = await response.json()
+
+        wanted = set(batch)
+        snapshots = {}
+        for p in data.get('pairs') or []:
+            if p.get('chainId') != 'solana': continue
+            mint = p.get('baseToken', {}).get('address')
+            if mint not in wanted: continue
+            snap = snapshots.get(mint)
+            if snap is None:
+                # Same rule as get_token_data: first Solana pair is the "Main" one
+                snap = snapshots[mint] = {
+                    "price": float(p.get('priceUsd') or 0),
+                    "market_cap": float(p.get('marketCap') or 0),
+                    "liquidity": 0.0,
+                    "volume_24h": 0.0
+                }
+            snap['liquidity'] += float(p.get('liquidity', {}).get('usd', 0))
+            snap['volume_24h'] += float(p.get('volume', {}).get('h24', 0))
+        return snapshots
+
+    async def check_safety(self, token_address):
+        """RugCheck + on-chain authority/holder checks, saved per mint (see safety.py)"""
+        try:
+            return await self.safety.check(token_address)
         except Exception as e:
-            print(f"⚠️ RugCheck Error: {e}")
+            print(f"⚠️ Safety Check Error: {e}")
         return {"score": "Unknown", "risks": []}
 
+    async def get_token_report(self, token_address):
+        """Market data and safety fetched at the same time"""
+        token_data, safety_data = await asyncio.gather(
+            self.get_token_data(token_address),
+            self.check_safety(token_address)
+        )
+        if token_data:
+            token_data['top_10_percentage'] = safety_data.get('top_10_percentage', 0)
+        return token_data, safety_data
+
     async def get_swap_transaction(self, user_pubkey, input_mint, output_mint, amount_lamports):
-        params = {
+        swap = await self.get_swap(user_pubkey, input_mint, output_mint, amount_lamports)
+        return swap['tx'] if swap else None
+
+    async def get_quote(self, input_mint, output_mint, amount_lamports):
+        """Jupiter quote only (no transaction), used by paper trading"""
+        conn = aiohttp.TCPConnector(family=socket.AF_INET, ssl=False)
+        async with aiohttp.ClientSession(connector=conn) as session:
+            try:
+                params = self._quote_params(input_mint, output_mint, amount_lamports)
+                async with session.get(self.jupiter_quote_api, params=params) as response:
+                    if response.status != 200: return None
+                    return await response.json()
+            except Exception as e:
+                print(f"⚠️ Jupiter Connection Error: {e}")
+                return None
+
+    @staticmethod
+    def _quote_params(input_mint, output_mint, amount_lamports):
+        return {
             "inputMint": input_mint,
             "outputMint": output_mint,
             "amount": str(amount_lamports),
             "slippageBps": 100
         }
+
+    async def get_swap(self, user_pubkey, input_mint, output_mint, amount_lamports):
+        """Jupiter quote + swap tx. Returns {"tx": base64 tx, "quote": quote, "last_valid_block_height": int} or None"""
+        params = self._quote_params(input_mint, output_mint, amount_lamports)
         conn = aiohttp.TCPConnector(family=socket.AF_INET, ssl=False)
         async with aiohttp.ClientSession(connector=conn) as session:
             try:
@@ -117,7 +211,12 @@ class DataEngine:
                 async with session.post(self.jupiter_swap_api, json=payload) as response:
                     if response.status != 200: return None
                     swap_data = await response.json()
-                    return swap_data.get('swapTransaction')
+                    if not swap_data.get('swapTransaction'): return None
+                    return {
+                        "tx": swap_data['swapTransaction'],
+                        "quote": quote_data,
+                        "last_valid_block_height": swap_data.get('lastValidBlockHeight')
+                    }
             except Exception as e:
                 print(f"⚠️ Jupiter Connection Error: {e}")
                 return None
\ No newline at end of file
@@ -0,0 +1,238 @@
+import asyncio
+import heapq
+import itertools
+import logging
+from collections import namedtuple
+
+#Settings
+TRAILING_STOP_PCT = 10 # sell everything if price drops 10% from the peak
+TRAILING_ACTIVATION_PCT = 10 # ...once the peak is this far above entry, until then only the stop loss applies
+TP_LADDER = ((30, 0.5), (60, 0.5), (100, 1.0)) # (gain %, fraction of what is left to sell)
+MAX_PARALLEL_EXITS = 16
+
+# One exit to send to the swap path. entry/peak/rung are kept so a failed exit can be retried
+ExitOrder = namedtuple("ExitOrder", "position_id mint symbol amount reason price entry peak rung")
+
+
+class ExitPosition:
+    # slots keep thousands of positions small in memory
+    __slots__ = ("position_id", "mint", "symbol", "entry", "peak", "stop", "target", "rung", "amount", "alive")
+
+    def __init__(self, position_id, mint, symbol, entry, amount):
+        self.position_id = position_id
+        self.mint = mint
+        self.symbol = symbol
+        self.entry = float(entry)
+        self.peak = float(entry)
+        self.stop = 0.0
+        self.target = None
+        self.rung = 0
+        self.amount = int(amount)
+        self.alive = True
+
+
+class _MintBook:
+    """Threshold indexes for every position on one mint.
+    Heap entries are (level, seq, position) and are dropped lazily:
+    an entry is only valid while it still matches the position's current level."""
+    __slots__ = ("stops", "targets", "peaks", "live")
+
+    def __init__(self):
+        self.stops = []   # max-heap on stop level (stored negative)
+        self.targets = [] # min-heap on next take-profit level
+        self.peaks = []   # min-heap on peak, to find positions a new high moves
+        self.live = 0
+
+
+class ExitEngine:
+    def __init__(self, take_profit_pct=30, stop_loss_pct=15, trailing_stop_pct=TRAILING_STOP_PCT, ladder=None,
+                 trailing_activation_pct=TRAILING_ACTIVATION_PCT):
+        self.stop_loss = stop_loss_pct / 100
+        self.trailing = trailing_stop_pct / 100
+        self.activation = 1 + trailing_activation_pct / 100
+        # First rung always follows the bot's TAKE_PROFIT_PCT
+        ladder = ladder or ((take_profit_pct, TP_LADDER[0][1]),) + TP_LADDER[1:]
+        self.ladder = tuple((1 + pct / 100, fraction) for pct, fraction in ladder)
+        self.positions = {}
+        self.books = {}
+        self._seq = itertools.count()
+
+    # ---------------- POSITIONS ----------------
+    def add_position(self, position_id, mint, entry_price, amount_tokens, symbol=None):
+        if position_id in self.positions:
+            self.remove_position(position_id)
+        pos = ExitPosition(position_id, mint, symbol, entry_price, amount_tokens)
+        book = self.books.setdefault(mint, _MintBook())
+        book.live += 1
+        self.positions[position_id] = pos
+        self._index(book, pos)
+        return pos
+
+    def remove_position(self, position_id):
+        pos = self.positions.pop(position_id, None)
+        if pos is None: return
+        pos.alive = False
+        book = self.books[pos.mint]
+        book.live -= 1
+        if book.live == 0:
+            del self.books[pos.mint]
+
+    def load(self, tracked_positions):
+        """Rebuilds state from TradeTracker positions (keyed by token address)"""
+        for token_address, p in (tracked_positions or {}).items():
+            if p.get("status", "OPEN") != "OPEN": continue
+            self.add_position(token_address, token_address, p["entry_price"], p["amount_tokens"], p.get("symbol"))
+
+    def mints(self):
+        return list(self.books)
+
+    def checkpoint_state(self):
+        # Peaks and ladder progress aren't in TradeTracker, keep them across restarts
+        return {pid: [p.peak, p.rung] for pid, p in self.positions.items()}
+
+    def restore_state(self, state):
+        for pid, (peak, rung) in (state or {}).items():
+            pos = self.positions.get(pid)
+            if pos is None: continue # closed while we were down
+            pos.peak = max(pos.peak, float(peak))
+            pos.rung = int(rung)
+            self._index(self.books[pos.mint], pos)
+
+    # ---------------- TICKS ----------------
+    def on_price(self, mint, price):
+        """Feeds one price update. Only positions whose thresholds are crossed are touched."""
+        book = self.books.get(mint)
+        if book is None or price <= 0: return []
+        orders = []
+
+        # 1. New high: raise peak and trailing stop of positions below it
+        while book.peaks and book.peaks[0][0] < price:
+            _, _, pos = heapq.heappop(book.peaks)
+            if not pos.alive or pos.peak >= price: continue
+            pos.peak = price
+            self._index(book, pos, target=False)
+
+        # 2. Take-profit ladder
+        while book.targets and book.targets[0][0] <= price:
+            level, _, pos = heapq.heappop(book.targets)
+            if not pos.alive or pos.target != level: continue
+            order = self._take_profit(pos, price)
+            if order: orders.append(order)
+            if pos.alive:
+                self._index(book, pos, peak=False, stop=False)
+
+        # 3. Stop loss / trailing stop
+        while book.stops and -book.stops[0][0] >= price:
+            level, _, pos = heapq.heappop(book.stops)
+            if not pos.alive or pos.stop != -level: continue
+            reason = "TRAILING_STOP" if pos.stop > pos.entry * (1 - self.stop_loss) else "STOP_LOSS"
+            orders.append(self._order(pos, pos.amount, reason, price, pos.rung))
+            self.remove_position(pos.position_id)
+
+        self._compact(book)
+        return orders
+
+    def on_prices(self, prices):
+        orders = []
+        for mint, price in prices.items():
+            orders.extend(self.on_price(mint, price))
+        return orders
+
+    # ---------------- EXECUTION ----------------
+    async def execute(self, orders, swap_fn):
+        """Sends all exits to the swap path at the same time.
+        swap_fn(order) must return a signature or None. Failed exits are put back."""
+        limit = asyncio.Semaphore(MAX_PARALLEL_EXITS)
+
+        def settle(order, task):
+            # a send that outlived a cancelled tick still has to put its tokens back if it failed
+            if task.cancelled() or task.exception() is not None or not task.result():
+                self.restore(order)
+
+        async def run(order):
+            async with limit:
+                task = asyncio.ensure_future(swap_fn(order))
+                try:
+                    sig = await asyncio.shield(task)
+                except asyncio.CancelledError:
+                    task.add_done_callback(lambda t: settle(order, t))
+                    raise
+                except Exception as e:
+                    logging.error(f"Exit Error ({order.mint}): {e}")
+                    sig = None
+            if not sig:
+                self.restore(order)
+            return order, sig
+
+        return await asyncio.gather(*(run(o) for o in orders))
+
+    def restore(self, order):
+        """Puts tokens from a failed exit back so the next tick retries it"""
+        pos = self.positions.get(order.position_id)
+        if pos is None:
+            # the order had closed it: come back on the same rung, with the stop from the same peak
+            pos = self.add_position(order.position_id, order.mint, order.entry, 0, order.symbol)
+            pos.peak = order.peak
+            pos.rung = order.rung
+        else:
+            pos.rung = min(pos.rung, order.rung)
+        pos.amount += order.amount
+        book = self.books[pos.mint]
+        self._index(book, pos)
+
+    def reserve(self, position_id, amount):
+        """Takes tokens already on their way out (a sell still pending) off a position"""
+        pos = self.positions.get(position_id)
+        if pos is None: return
+        pos.amount -= int(amount)
+        if pos.amount <= 0:
+            self.remove_position(position_id)
+
+    # ---------------- INTERNALS ----------------
+    def _take_profit(self, pos, price):
+        _, fraction = self.ladder[pos.rung]
+        rung = pos.rung
+        pos.rung += 1
+        sell = int(pos.amount * fraction)
+        if pos.rung >= len(self.ladder) or sell >= pos.amount:
+            order = self._order(pos, pos.amount, "TAKE_PROFIT", price, rung)
+            self.remove_position(pos.position_id)
+            return order
+        if sell <= 0: return None
+        pos.amount -= sell
+        return self._order(pos, sell, "TAKE_PROFIT", price, rung)
+
+    @staticmethod
+    def _order(pos, amount, reason, price, rung):
+        return ExitOrder(pos.position_id, pos.mint, pos.symbol, amount, reason, price, pos.entry, pos.peak, rung)
+
+    def _index(self, book, pos, stop=True, target=True, peak=True):
+        seq = next(self._seq)
+        if stop:
+            pos.stop = pos.entry * (1 - self.stop_loss)
+            if pos.peak >= pos.entry * self.activation:
+                pos.stop = max(pos.stop, pos.peak * (1 - self.trailing))
+            heapq.heappush(book.stops, (-pos.stop, seq, pos))
+        if target:
+            pos.target = pos.entry * self.ladder[pos.rung][0] if pos.rung < len(self.ladder) else None
+            if pos.target is not None:
+                heapq.heappush(book.targets, (pos.target, seq, pos))
+        if peak:
+            heapq.heappush(book.peaks, (pos.peak, seq, pos))
+
+    def _compact(self, book):
+        # Stale entries pile up when peaks move every tick; rebuild once they dominate
+        limit = 4 * book.live + 64
+        for name in ("stops", "targets", "peaks"):
+            heap = getattr(book, name)
+            if len(heap) > limit:
+                fresh = [e for e in heap if e[2].alive and self._current(name, e)]
+                heapq.heapify(fresh)
+                setattr(book, name, fresh)
+
+    @staticmethod
+    def _current(name, entry):
+        level, _, pos = entry
+        if name == "stops": return pos.stop == -level
+        if name == "targets": return pos.target == level
+        return pos.peak == level
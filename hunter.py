@@ -1,15 +1,27 @@
 import aiohttp
 import asyncio
+import time
 from data_engine import DataEngine
+from sources import CandidateSource, SourceRegistry, CoinIndex
+
+SEEN_TTL = 30 * 60 # auto-trader skips tokens it screened in the last 30 min
 
 class Hunter:
-    def __init__(self, ai_analyst):
+    def __init__(self, ai_analyst, data_engine=None):
         self.coingecko_api = "https://api.coingecko.com/api/v3/search/trending"
         # Search specifically for "pump" to find Pump.fun tokens
         self.pump_search_api = "https://api.dexscreener.com/latest/dex/search?q=pump" 
         self.dex_search_api = "https://api.dexscreener.com/latest/dex/search?q=solana"
-        self.data_engine = DataEngine()
+        self.data_engine = data_engine or DataEngine() # share the bot's so there is one safety cache
         self.ai = ai_analyst
+        self.seen = {} # token address -> last time it was screened
+        self.coins = CoinIndex()
+
+        # Combined in priority order (Pump > Dex > CG). freshness = seconds between polls at best
+        self.sources = SourceRegistry()
+        self.sources.register(CandidateSource("pump", self.get_pump_fun_targets, cost=1, freshness=60, priority=0)) # The Degen plays
+        self.sources.register(CandidateSource("dexscreener", self.get_trending_dexscreener, cost=1, freshness=120, priority=1)) # The Safe plays
+        self.sources.register(CandidateSource("coingecko", self.get_coingecko_mints, cost=2, freshness=600, priority=2)) # Usually quiet for SOL
 
     async def get_trending_coingecko(self):
         """Plan A: Check Global Trending list"""
@@ -25,11 +37,20 @@ class Hunter:
                 item = coin['item']
                 slug = item.get('slug', '').lower()
                 if 'solana' in slug or 'sol' in slug:
-                    candidates.append({"address": None, "symbol": item['symbol'], "source": "CoinGecko"})
+                    candidates.append({"address": None, "id": item.get('id'), "symbol": item['symbol'], "source": "CoinGecko"})
             return candidates
         except Exception:
             return []
 
+    async def get_coingecko_mints(self):
+        """Plan A, with coins resolved to their Solana contract through the cached coin index"""
+        candidates = [c for c in await self.get_trending_coingecko() if c.get('id')]
+        if not candidates: return []
+        mints = await self.coins.resolve(c['id'] for c in candidates)
+        for c in candidates:
+            c['address'] = mints.get(c['id'])
+        return [c for c in candidates if c['address']]
+
     async def get_pump_fun_targets(self):
         """Plan C: Scan specifically for Pump.fun tokens"""
         print("💊 Scanning Pump.fun ecosystem...")
@@ -96,41 +117,35 @@ class Hunter:
         except Exception:
             return []
 
-    async def hunt(self):
-        """The Main Function"""
-        
-        # 1. Gather candidates from all sources
-        cg_candidates = await self.get_trending_coingecko() # Usually empty for SOL
-        pump_candidates = await self.get_pump_fun_targets() # The Degen plays
-        dex_candidates = await self.get_trending_dexscreener() # The Safe plays
-        
-        # Combine them (Prioritize Pump > Dex > CG)
-        all_candidates = pump_candidates + dex_candidates
+    async def find_candidates(self, skip_seen=False, force=False):
+        """Step 1: Gather candidates from the sources that are due (see sources.py).
+        skip_seen drops tokens already screened in the last SEEN_TTL (used by the auto-trader)"""
+        all_candidates = await self.sources.collect(force=force)
         
         # Remove duplicates based on address
         unique_candidates = []
         seen_addresses = set()
+        cutoff = time.time() - SEEN_TTL
         for item in all_candidates:
-            if item['address'] not in seen_addresses:
-                unique_candidates.append(item)
-                seen_addresses.add(item['address'])
-
-        if not unique_candidates:
-            return "❌ **Market is frozen.** No coins found matching criteria."
+            if item['address'] in seen_addresses: continue
+            if skip_seen and self.seen.get(item['address'], 0) > cutoff: continue
+            unique_candidates.append(item)
+            seen_addresses.add(item['address'])
+        return unique_candidates
 
-        # 2. Analyze
-        print(f"🔎 Analyzing {len(unique_candidates)} potential gems...")
+    async def screen(self, candidates):
+        """Step 2: Keep candidates with market data and an acceptable safety score"""
+        print(f"🔎 Analyzing {len(candidates)} potential gems...")
         valid_coins = []
         
-        for item in unique_candidates[:5]: # Limit to 5
+        for item in candidates[:5]: # Limit to 5
             address = item['address']
+            self.seen[address] = time.time()
             
-            # Get Data
-            token_data = await self.data_engine.get_token_data(address)
+            # Get Data + Safety
+            token_data, safety_data = await self.data_engine.get_token_report(address)
             if not token_data: continue
-            
-            # Check Safety
-            safety_data = await self.data_engine.check_safety(address)
+            if not isinstance(safety_data['score'], (int, float)): continue # No safety data, skip
             
             # Filter: 
             # If it's Pump.fun, we allow riskier scores (up to 60)
@@ -143,6 +158,30 @@ class Hunter:
                     "safety": safety_data,
                     "source": item['source']
                 })
+        return valid_coins
+
+    def checkpoint_state(self):
+        # Discovery cursor: what was screened recently, so a restart doesn't redo it
+        cutoff = time.time() - SEEN_TTL
+        self.seen = {address: ts for address, ts in self.seen.items() if ts > cutoff}
+        return {"seen": self.seen, "sources": self.sources.checkpoint_state(), "coins": self.coins.checkpoint_state()}
+
+    async def restore_state(self, state):
+        self.seen.update(state.get("seen", {}))
+        self.sources.restore_state(state.get("sources"))
+        self.coins.restore_state(state.get("coins"))
+
+    async def hunt(self):
+        """The Main Function"""
+        
+        # 1. Gather candidates from all sources
+        unique_candidates = await self.find_candidates()
+
+        if not unique_candidates:
+            return "❌ **Market is frozen.** No coins found matching criteria."
+
+        # 2. Analyze
+        valid_coins = await self.screen(unique_candidates)
 
         if not valid_coins:
             return "⚠️ Found coins, but they were all flagged as **Too Dangerous**."
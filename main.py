@@ -13,6 +13,11 @@ from wallet import WalletManager
 from data_engine import DataEngine
 from ai_analyst import AIAnalyst
 from hunter import Hunter
+from watchlist import Watchlist, parse_amount
+from tracker import TradeTracker
+from auto_engine import AutoTrader
+from checkpoint import Checkpointer
+from paper import PaperExchange
 
 #Setup And Configs
 load_dotenv()
@@ -27,7 +32,20 @@ logging.basicConfig(
 wallet= WalletManager()
 data_engine= DataEngine()
 ai_brain= AIAnalyst()
-hunter_bot = Hunter(ai_brain)
+hunter_bot = Hunter(ai_brain, data_engine)
+watchlist= Watchlist(data_engine)
+PAPER_TRADING = os.getenv("PAPER_TRADING") == "1" # simulated fills and a virtual balance, no real SOL
+
+tracker= TradeTracker("paper_positions.json" if PAPER_TRADING else "positions.json")
+auto_trader= AutoTrader(wallet, data_engine, hunter_bot, tracker, None) # telegram app is set once built
+checkpointer= Checkpointer("paper_checkpoint.json.gz" if PAPER_TRADING else "checkpoint.json.gz")
+checkpointer.register("auto_trader", auto_trader)
+checkpointer.register("hunter", hunter_bot)
+checkpointer.add_hook(data_engine.safety.save_results) # safety.json is written on the checkpoint tick
+if PAPER_TRADING:
+    auto_trader.paper= PaperExchange(data_engine)
+    checkpointer.register("paper", auto_trader.paper)
+    print("📝 PAPER TRADING mode: swaps are simulated")
 
 #Constants
 SOL_MINT = "So11111111111111111111111111111111111111112"
@@ -38,6 +56,8 @@ DEXSCREENER_BASE_URL = "https://dexscreener.com/solana/"
 #get solana balance on the wallet
 async def get_solana_balance(address_str):
     #Connect to the rpc and check the  balance 
+    if auto_trader.paper:
+        return auto_trader.paper.get_balance_sol()
     try:
         #connect to the rpc
         async with AsyncClient("https://api.mainnet-beta.solana.com") as client:
@@ -63,7 +83,8 @@ async def start(update:Update, context: ContextTypes.DEFAULT_TYPE):
         f"💳 **Wallet:** `{pubkey}`\n"
         f"⚠️ **Balance:** Check Solscan (Send SOL here to trade)\n\n"
         f"🚀 **How to use:**\n"
-        f"Just paste a Token Address (CA) to scan and trade.",
+        f"Just paste a Token Address (CA) to scan and trade.\n"
+        f"👀 /watch a token to get price, liquidity or volume alerts.",
         parse_mode=ParseMode.MARKDOWN
     )
 
@@ -82,8 +103,8 @@ async def analyze_token_logic(chat_id, token_address, context, message_id_to_edi
         msg= await context.bot.send_message(chat_id=chat_id, text=f"🔍 Scanning {token_address}...")
         message_id_to_edit = msg.message_id
 
-    #fetch data (DexScreener)
-    token_data= await data_engine.get_token_data(token_address)
+    #fetch data (DexScreener) and safety (RugCheck + on-chain) together
+    token_data, safety_data = await data_engine.get_token_report(token_address)
     if not token_data:
         await context.bot.edit_message_text(
             chat_id=chat_id,
@@ -91,9 +112,6 @@ async def analyze_token_logic(chat_id, token_address, context, message_id_to_edi
             text="❌ **Error:** Token not found on DexScreener."
         )
         return
-    
-    #Check Safety
-    safety_data = await data_engine.check_safety(token_address)
 
     #Analysis (gemini) update status user
     await context.bot.edit_message_text(
@@ -102,7 +120,16 @@ async def analyze_token_logic(chat_id, token_address, context, message_id_to_edi
         text=f"🧠 AI is analyzing {token_data['symbol']}..."
     )
 
-    ai_result= await ai_brain.analyze_token(token_data, safety_data)
+    #show the verdict as soon as it streams in, the reasoning follows
+    async def show_verdict(verdict):
+        emoji= "🟢" if verdict == "BUY" else "🔴"
+        await context.bot.edit_message_text(
+            chat_id=chat_id,
+            message_id=message_id_to_edit,
+            text=f"{emoji} AI Verdict for {token_data['symbol']}: {verdict}\n✍️ Writing reasoning..."
+        )
+
+    ai_result= await ai_brain.analyze_token(token_data, safety_data, on_verdict=show_verdict)
 
     #Format Output msg, Determine emojis based on data
 
@@ -171,6 +198,70 @@ async def hunt_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         parse_mode=ParseMode.MARKDOWN
     )
 
+async def watch_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    #/watch <CA> <price|liq|vol|mcap> <above|below> <value>   or just /watch to list
+    chat_id = update.message.chat_id
+    args = context.args
+
+    if not args:
+        alerts = watchlist.get_alerts(chat_id)
+        if not alerts:
+            text = "👀 **No alerts yet.**\nUsage: `/watch <CA> price above 0.002`\nMetrics: price, liq, vol, mcap (50k / 1.5m work)"
+        else:
+            text = "👀 **Your Alerts**\n\n" + "\n".join(f"{a.describe()}\n`{a.mint}`" for a in alerts)
+        await update.message.reply_text(text, parse_mode=ParseMode.MARKDOWN)
+        return
+
+    if len(args) != 4:
+        await update.message.reply_text("❌ Usage: `/watch <CA> <price|liq|vol|mcap> <above|below> <value>`", parse_mode=ParseMode.MARKDOWN)
+        return
+
+    token_address, metric, direction, value = args
+    try:
+        alert = watchlist.add_alert(chat_id, token_address, metric.lower(), direction.lower(), parse_amount(value))
+    except ValueError as e:
+        await update.message.reply_text(f"❌ {e}")
+        return
+
+    await update.message.reply_text(f"✅ **Watching** {alert.describe()}\n`{token_address}`", parse_mode=ParseMode.MARKDOWN)
+
+async def unwatch_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    #/unwatch <alert id>  or  /unwatch <CA> to drop every alert on that token
+    chat_id = update.message.chat_id
+    if not context.args:
+        await update.message.reply_text("❌ Usage: `/unwatch <id>` or `/unwatch <CA>`", parse_mode=ParseMode.MARKDOWN)
+        return
+
+    target = context.args[0].lstrip("#")
+    if target.isdigit():
+        removed = 1 if watchlist.remove_alert(chat_id, int(target)) else 0
+    else:
+        removed = watchlist.remove_mint(chat_id, target)
+    await update.message.reply_text(f"🗑️ Removed {removed} alert(s).")
+
+async def auto_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    #start auto trading, alerts go to this chat
+    text= await auto_trader.start(update.message.chat_id)
+    checkpointer.save()
+    await update.message.reply_text(text, parse_mode=ParseMode.MARKDOWN)
+
+async def stop_auto_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    text= await auto_trader.stop()
+    checkpointer.save()
+    await update.message.reply_text(text, parse_mode=ParseMode.MARKDOWN)
+
+async def ai_stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    #tokens and latency of the recent AI calls
+    stats= ai_brain.get_stats()
+    text= (
+        f"🧠 **AI Stats** (last {stats['calls']} calls)\n"
+        f"• Prompt tokens: {stats['avg_prompt_tokens']} (cached: {stats['avg_cached_tokens']})\n"
+        f"• Output tokens: {stats['avg_output_tokens']}\n"
+        f"• Time to verdict: {stats['avg_verdict_ms']}ms\n"
+        f"• Full response: {stats['avg_total_ms']}ms"
+    )
+    await update.message.reply_text(text, parse_mode=ParseMode.MARKDOWN)
+
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Detects when user pastes a CA"""
     # Check if message has text (it might be a photo or sticker)
@@ -239,48 +330,21 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
             #Convert Sol do Lamports
             lamports= int(amount_sol *1_000_000_000)
 
-            #get Tx from jupidet
-            swap_tx_base64= await data_engine.get_swap_transaction(
-                wallet.get_public_key(),
-                SOL_MINT, 
-                token_address, 
-                lamports
+            #same swap path as the auto-trader (quote -> sign -> send, or a paper fill)
+            tx_sig= await auto_trader.execute_swap(
+                SOL_MINT, token_address, lamports,
+                info={"source": "button", "chat_id": query.message.chat_id}, raise_errors=True
             )
-            
-            if not swap_tx_base64:
-                await query.message.reply_text("❌ **Error:** Failed to get quote from Jupiter. Slippage might be too low.")
+            if not tx_sig:
+                await query.message.reply_text("❌ **Trade Failed:** Jupiter quote or send failed. Slippage might be too low.")
                 return
-            
-            #Sign and send 
-            #Improt here fo keep clean 
-            from solana.rpc.async_api import AsyncClient
-            from solders.transaction import VersionedTransaction
-            from solders.message import to_bytes_versioned
-            import base64
-
-            #use public RPC 
-            rpc_client = AsyncClient("https://api.mainnet-beta.solana.com")
-
-            #desserializar convert 
-            tx_bytes= base64.b64decode(swap_tx_base64)
-            tx= VersionedTransaction.from_bytes(tx_bytes)
-
-            #sign
-            keypair= wallet.get_keypair()
-            message= to_bytes_versioned(tx.message)
-            signature= keypair.sign_message(message)
-            signet_tx = VersionedTransaction.populate(tx.message, [signature])
-
-            #send
-            result = await rpc_client.send_transaction(signet_tx)
-            await rpc_client.close()
-
-            tx_sig= str(result.value)
-
-            #Success Message
+
+            if tx_sig not in auto_trader.confirmations.pending:
+                return # paper fills land right away, the landed alert is already out
+
+            #Sent, the "Buy Landed" alert follows once it confirms
             await query.message.reply_text(
-                f"✅ **Trade Sent!**\n"
-                f"🔗 [View on Solscan](https://solscan.io/tx/{tx_sig})",
+                f"📤 **Trade Sent!** I'll confirm when it lands.\n" + auto_trader.tx_link(tx_sig),
                 parse_mode=ParseMode.MARKDOWN,
                 disable_web_page_preview=True
             )
@@ -327,13 +391,31 @@ if __name__ == '__main__':
         print("❌ Error: TELEGRAM_TOKEN not found in .env")
         exit(1)
     
+    #once the bot is up: restore the last checkpoint (resumes loops), start the pollers and the confirmation tracker
+    async def post_init(application):
+        async def send_alert(chat_id, text):
+            await application.bot.send_message(chat_id=chat_id, text=text, parse_mode=ParseMode.MARKDOWN)
+        await checkpointer.restore()
+        asyncio.create_task(watchlist.run(send_alert))
+        asyncio.create_task(checkpointer.run())
+        asyncio.create_task(auto_trader.confirmations.run())
+
+    async def post_shutdown(application):
+        checkpointer.save()
+
     #Build app
-    app = ApplicationBuilder().token(token).build()
+    app = ApplicationBuilder().token(token).post_init(post_init).post_shutdown(post_shutdown).build()
+    auto_trader.bot = app
 
     #add handlers
     app.add_handler(CommandHandler("start", start))
     app.add_handler(CommandHandler("wallet", wallet_info))
     app.add_handler(CommandHandler("hunt", hunt_command))
+    app.add_handler(CommandHandler("watch", watch_command))
+    app.add_handler(CommandHandler("unwatch", unwatch_command))
+    app.add_handler(CommandHandler("auto", auto_command))
+    app.add_handler(CommandHandler("stopauto", stop_auto_command))
+    app.add_handler(CommandHandler("aistats", ai_stats_command))
     app.add_handler(MessageHandler(filters.TEXT & (~filters.COMMAND), handle_message))
     app.add_handler(CallbackQueryHandler(button_handler))
 
@@ -0,0 +1,316 @@
+#Local stand-in for every upstream the bot talks to (DexScreener, CoinGecko, RugCheck, Jupiter, Solana RPC).
+#Replays recorded responses with configurable latency and error injection, for benchmarks.
+import asyncio
+import base64
+import json
+import random
+import time
+import aiohttp
+from aiohttp import web
+from rpc_stub import POOL_OWNER, RpcStub
+from safety import SOLANA_RPC_URL
+
+SOL_MINT = "So11111111111111111111111111111111111111112"
+ROUTES = ("dexscreener", "coingecko", "rugcheck", "jupiter", "rpc")
+
+
+def synthetic_fixtures(n_tokens=50, seed=7):
+    """Builds responses in the same shape the real APIs return, for n fake tokens"""
+    rng = random.Random(seed)
+    now_ms = time.time() * 1000
+    mints = [f"Bench{i:04d}" + "1" * 35 for i in range(n_tokens)]
+
+    tokens = {}
+    for mint in mints:
+        price = rng.uniform(0.00001, 2)
+        tokens[mint] = [{
+            "chainId": "solana",
+            "pairAddress": "Pair" + mint[4:],
+            "baseToken": {"address": mint, "name": f"Bench Token {mint[5:9]}", "symbol": f"B{mint[5:9]}"},
+            "priceUsd": f"{price:.8f}",
+            "liquidity": {"usd": rng.uniform(2_000, 500_000)},
+            "volume": {"h24": rng.uniform(5_000, 2_000_000)},
+            "fdv": price * 1e9,
+            "marketCap": price * 1e9,
+            "pairCreatedAt": now_ms - rng.uniform(1, 500) * 3600 * 1000,
+            "priceChange": {"h1": rng.uniform(-20, 40), "h24": rng.uniform(-50, 200)},
+            "txns": {"h24": {"buys": rng.randint(50, 5000), "sells": rng.randint(50, 5000)}}
+        }]
+
+    all_pairs = [pair for pairs in tokens.values() for pair in pairs]
+    return {
+        "tokens": tokens,
+        "search": {"pump": {"pairs": all_pairs[:30]}, "solana": {"pairs": all_pairs[-30:]}},
+        "trending": {"coins": [{"item": {"id": f"{p['baseToken']['symbol'].lower()}-solana", "symbol": p["baseToken"]["symbol"],
+                                         "slug": f"{p['baseToken']['symbol'].lower()}-solana"}}
+                               for p in all_pairs[:7]]},
+        # CoinGecko /coins/{id}: the contract addresses, like the real detail endpoint
+        "coins": {f"{p['baseToken']['symbol'].lower()}-solana": {"platforms": {"solana": p["baseToken"]["address"]}}
+                  for p in all_pairs[:7]},
+        "mints": {m: {"supply": "1000000000000", "decimals": 6, "mintAuthority": None, "freezeAuthority": None} for m in mints},
+        # the largest account is the pool vault, like on most live tokens
+        "holders": {m: [{"amount": str(rng.randint(100, 400) * 10**9), "owner": POOL_OWNER}]
+                       + [str(rng.randint(1, 80) * 10**9) for _ in range(19)] for m in mints},
+        "reports": {m: {"score": rng.randint(0, 80), "risks": []} for m in mints},
+        "quote": {"inputMint": SOL_MINT, "inAmount": "20000000", "outAmount": "123456789", "slippageBps": 100},
+    }
+
+
+def load_fixtures(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+LIVE_HOSTS = {
+    "dexscreener": "https://api.dexscreener.com/",
+    "coingecko": "https://api.coingecko.com/",
+    "jupiter": "https://public.jupiterapi.com/",
+    "rugcheck": "https://api.rugcheck.xyz/v1/tokens/",
+    "rpc": SOLANA_RPC_URL,
+}
+
+
+async def record_fixtures(path, mints, hosts=None):
+    """Fetches responses once for the given mints and saves them for replay.
+    hosts overrides LIVE_HOSTS (e.g. MockUpstream.hosts to record the mock itself)."""
+    hosts = {**LIVE_HOSTS, **(hosts or {})}
+    rugcheck_api, rpc_url = hosts["rugcheck"], hosts["rpc"]
+    dex, cg, jup = hosts["dexscreener"], hosts["coingecko"], hosts["jupiter"]
+    fixtures = synthetic_fixtures(0)
+    async with aiohttp.ClientSession() as session:
+        async def get(url, **kwargs):
+            async with session.get(url, **kwargs) as response:
+                return await response.json() if response.status == 200 else None
+
+        async def rpc(method, params):
+            payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+            async with session.post(rpc_url, json=payload) as response:
+                if response.status != 200: return None
+                data = await response.json()
+                return (data.get("result") or {}).get("value")
+
+        for q in ("pump", "solana"):
+            fixtures["search"][q] = await get(f"{dex}latest/dex/search?q={q}") or {"pairs": []}
+        fixtures["trending"] = await get(f"{cg}api/v3/search/trending") or {"coins": []}
+        for coin in fixtures["trending"].get("coins", []):
+            coin_id = coin.get("item", {}).get("id")
+            detail = await get(f"{cg}api/v3/coins/{coin_id}", params={"tickers": "false", "market_data": "false"}) if coin_id else None
+            if detail:
+                fixtures["coins"][coin_id] = {"platforms": detail.get("platforms") or {}}
+        for mint in mints:
+            data = await get(f"{dex}latest/dex/tokens/{mint}") or {}
+            fixtures["tokens"][mint] = data.get("pairs") or []
+            report = await get(f"{rugcheck_api}{mint}/report")
+            if report:
+                fixtures["reports"][mint] = {"score": report.get("score", 0), "risks": report.get("risks", [])}
+            # on-chain data for SafetyChecker, same calls it makes in production
+            account = await rpc("getAccountInfo", [mint, {"encoding": "jsonParsed"}])
+            info = (((account or {}).get("data") or {}).get("parsed") or {}).get("info")
+            if info:
+                fixtures["mints"][mint] = {k: info.get(k) for k in ("supply", "decimals", "mintAuthority", "freezeAuthority")}
+            largest = await rpc("getTokenLargestAccounts", [mint])
+            if largest:
+                accounts = await rpc("getMultipleAccounts", [[a["address"] for a in largest], {"encoding": "jsonParsed"}]) or []
+                owners = [(((acc or {}).get("data") or {}).get("parsed") or {}).get("info", {}).get("owner") for acc in accounts]
+                fixtures["holders"][mint] = [{"amount": a["amount"], "owner": o} if o else a["amount"]
+                                             for a, o in zip(largest, owners + [None] * len(largest))]
+        if mints:
+            fixtures["quote"] = await get(f"{jup}quote", params={
+                "inputMint": SOL_MINT, "outputMint": mints[0], "amount": "20000000", "slippageBps": 100
+            }) or fixtures["quote"]
+
+    with open(path, 'w') as f:
+        json.dump(fixtures, f)
+    print(f"📼 Recorded {len(mints)} tokens to {path}")
+    return fixtures
+
+
+class MockUpstream(RpcStub):
+    """latency: seconds added to every response (float, or dict per route name in ROUTES)
+    error_rate: share of requests answered with HTTP 500 (float, or dict per route)"""
+
+    def __init__(self, fixtures=None, latency=0.0, jitter=0.0, error_rate=0.0, seed=1, port=0):
+        self.fixtures = fixtures or synthetic_fixtures()
+        super().__init__(self.fixtures["mints"], self.fixtures["holders"], self.fixtures["reports"], port)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.requests = dict.fromkeys(ROUTES, 0)
+        self.errors = dict.fromkeys(ROUTES, 0)
+        self._swaps = {} # message bytes -> quote it was built from
+        self.sent = {} # signature -> (payer, quote), confirmed on the next status poll
+        self.block_height = 1000
+
+    @property
+    def hosts(self):
+        return {"dexscreener": self.url, "coingecko": self.url, "jupiter": self.url,
+                "rugcheck": self.rugcheck_api, "rpc": self.url}
+
+    @property
+    def mint_list(self):
+        return list(self.fixtures["tokens"])
+
+    def make_app(self):
+        app = super().make_app()
+        app.middlewares.append(self.inject)
+        app.router.add_get("/latest/dex/tokens/{mints}", self.handle_tokens)
+        app.router.add_get("/latest/dex/search", self.handle_search)
+        app.router.add_get("/api/v3/search/trending", self.handle_trending)
+        app.router.add_get("/api/v3/coins/{coin_id}", self.handle_coin)
+        app.router.add_get("/quote", self.handle_quote)
+        app.router.add_post("/swap", self.handle_swap)
+        return app
+
+    # ---------------- POINT THE BOT HERE ----------------
+    def patch_data_engine(self, engine):
+        base = self.url
+        engine.dex_api = base + "latest/dex/tokens/"
+        engine.rugcheck_api = self.rugcheck_api
+        engine.jupiter_quote_api = base + "quote"
+        engine.jupiter_swap_api = base + "swap"
+        engine.safety.rpc_url = base
+        engine.safety.rugcheck_api = self.rugcheck_api
+        return engine
+
+    def patch_hunter(self, hunter):
+        base = self.url
+        hunter.coingecko_api = base + "api/v3/search/trending"
+        hunter.pump_search_api = base + "latest/dex/search?q=pump"
+        hunter.dex_search_api = base + "latest/dex/search?q=solana"
+        hunter.coins.coins_api = base + "api/v3/coins/"
+        self.patch_data_engine(hunter.data_engine)
+        return hunter
+
+    # ---------------- LATENCY / ERRORS ----------------
+    @staticmethod
+    def _route(path):
+        if path.startswith("/latest/dex"): return "dexscreener"
+        if path.startswith("/api/v3"): return "coingecko"
+        if path.startswith("/v1/tokens"): return "rugcheck"
+        if path in ("/quote", "/swap"): return "jupiter"
+        return "rpc"
+
+    @staticmethod
+    def _setting(value, route):
+        return value.get(route, 0.0) if isinstance(value, dict) else value
+
+    @web.middleware
+    async def inject(self, request, handler):
+        route = self._route(request.path)
+        self.requests[route] += 1
+        delay = self._setting(self.latency, route)
+        if self.jitter:
+            delay += self.rng.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.rng.random() < self._setting(self.error_rate, route):
+            self.errors[route] += 1
+            return web.json_response({"error": "injected"}, status=500)
+        return await handler(request)
+
+    # ---------------- HANDLERS ----------------
+    async def handle_tokens(self, request):
+        pairs = []
+        for mint in request.match_info["mints"].split(","):
+            pairs.extend(self.fixtures["tokens"].get(mint, []))
+        return web.json_response({"pairs": pairs or None})
+
+    async def handle_search(self, request):
+        q = request.query.get("q", "")
+        if q in self.fixtures["search"]:
+            return web.json_response(self.fixtures["search"][q])
+        # anything else is a symbol lookup
+        pairs = [p for pairs in self.fixtures["tokens"].values() for p in pairs
+                 if p["baseToken"].get("symbol", "").upper() == q.upper()]
+        return web.json_response({"pairs": pairs})
+
+    async def handle_trending(self, request):
+        return web.json_response(self.fixtures["trending"])
+
+    async def handle_coin(self, request):
+        coin = self.fixtures.get("coins", {}).get(request.match_info["coin_id"])
+        if coin is None:
+            return web.json_response({"error": "coin not found"}, status=404)
+        return web.json_response(coin)
+
+    async def handle_quote(self, request):
+        quote = dict(self.fixtures["quote"])
+        quote.update(inputMint=request.query.get("inputMint"), outputMint=request.query.get("outputMint"),
+                     inAmount=request.query.get("amount"))
+        return web.json_response(quote)
+
+    async def handle_swap(self, request):
+        body = await request.json()
+        return web.json_response({
+            "swapTransaction": self._unsigned_tx(body.get("userPublicKey"), body.get("quoteResponse") or {}),
+            "lastValidBlockHeight": self.block_height + 150
+        })
+
+    async def handle_rpc(self, request):
+        body = await request.json()
+        method = body.get("method")
+        params = body.get("params", [])
+        if method == "sendTransaction":
+            from solders.transaction import VersionedTransaction
+            self.calls.append((method, None))
+            tx = VersionedTransaction.from_bytes(base64.b64decode(params[0]))
+            tx_sig = str(tx.signatures[0])
+            quote = self._swaps.get(bytes(tx.message))
+            if quote is not None:
+                self.sent[tx_sig] = (str(tx.message.account_keys[0]), quote)
+            return self._result(body, tx_sig)
+        if method == "getSignatureStatuses":
+            self.calls.append((method, None))
+            self.block_height += 1
+            statuses = [{"slot": 1, "confirmations": None, "err": None, "confirmationStatus": "confirmed"}
+                        if s in self.sent else None for s in params[0]]
+            return self._result(body, {"context": {"slot": 1}, "value": statuses})
+        if method == "getBlockHeight":
+            self.calls.append((method, None))
+            return self._result(body, self.block_height)
+        if method == "getTransaction":
+            self.calls.append((method, params[0]))
+            return self._result(body, self._confirmed_tx(params[0]))
+        return await super().handle_rpc(request)
+
+    @staticmethod
+    def _result(body, result):
+        return web.json_response({"jsonrpc": "2.0", "id": body.get("id"), "result": result})
+
+    def _confirmed_tx(self, tx_sig):
+        #jsonParsed shape with the balances the quote promised, so fills can be parsed
+        if tx_sig not in self.sent:
+            return None
+        payer, quote = self.sent[tx_sig]
+        amount_in, amount_out, fee = int(quote.get("inAmount", 0)), int(quote.get("outAmount", 0)), 5000
+        lamports = 10_000_000_000
+        if quote.get("inputMint") == SOL_MINT:
+            mint, tokens, post_lamports = quote.get("outputMint"), (0, amount_out), lamports - amount_in - fee
+        else:
+            mint, tokens, post_lamports = quote.get("inputMint"), (amount_in, 0), lamports + amount_out - fee
+
+        def balance(amount):
+            return [{"accountIndex": 1, "mint": mint, "owner": payer,
+                     "uiTokenAmount": {"amount": str(amount), "decimals": 6}}]
+        return {
+            "slot": 1,
+            "meta": {"err": None, "fee": fee, "preBalances": [lamports, 0], "postBalances": [post_lamports, 0],
+                     "preTokenBalances": balance(tokens[0]), "postTokenBalances": balance(tokens[1])},
+            "transaction": {"message": {"accountKeys": [{"pubkey": payer, "signer": True}]}}
+        }
+
+    def _unsigned_tx(self, user_pubkey, quote):
+        #a real v0 transaction paid by the user, unique per swap so every send gets its own signature
+        from solders.hash import Hash
+        from solders.message import MessageV0
+        from solders.null_signer import NullSigner
+        from solders.pubkey import Pubkey
+        from solders.system_program import TransferParams, transfer
+        from solders.transaction import VersionedTransaction
+        payer = Pubkey.from_string(user_pubkey)
+        ix = transfer(TransferParams(from_pubkey=payer, to_pubkey=payer, lamports=len(self._swaps) + 1))
+        message = MessageV0.try_compile(payer, [ix], [], Hash.default())
+        self._swaps[bytes(message)] = quote
+        tx = VersionedTransaction(message, [NullSigner(payer)])
+        return base64.b64encode(bytes(tx)).decode()
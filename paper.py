@@ -0,0 +1,231 @@
+#Paper trading: a simulated exchange that sits behind AutoTrader.execute_swap.
+#   PAPER_TRADING=1 python main.py        -> bot trades with a virtual balance
+#   python paper.py --ticks 200000        -> replay market data through the real strategy code
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+
+#Settings
+SOL_MINT = "So11111111111111111111111111111111111111112"
+START_BALANCE_SOL = 10
+SOL_PRICE_USD = 150 # used until a real SOL price is fed in
+TOKEN_DECIMALS = 6 # pump.fun tokens use 6
+POOL_FEE = 0.0025
+
+
+class PaperExchange:
+    """Fills swaps from, in order of preference:
+       1. recorded pool reserves (constant product, price impact included)
+       2. the last price fed in with set_price (replays)
+       3. a live Jupiter quote through data_engine (paper mode in the bot)
+    then applies the slippage/latency model and moves the virtual balances."""
+
+    def __init__(self, data_engine=None, balance_sol=START_BALANCE_SOL, slippage_bps=50, slippage_jitter_bps=50,
+                 latency_ms=0, latency_jitter_ms=0, fail_rate=0.0, seed=None):
+        self.data = data_engine
+        self.balances = {SOL_MINT: int(balance_sol * 1_000_000_000)}
+        self.start_lamports = self.balances[SOL_MINT]
+        self.prices = {SOL_MINT: SOL_PRICE_USD} # mint -> USD
+        self.reserves = {} # mint -> [sol lamports, token raw amount]
+        self.decimals = {}
+        self.cost_basis = {} # mint -> lamports spent on what we still hold
+        self.slippage_bps = slippage_bps
+        self.slippage_jitter_bps = slippage_jitter_bps
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.fail_rate = fail_rate
+        self.rng = random.Random(seed)
+        self._ids = itertools.count(1)
+        self.trades = 0
+        self.failed = 0
+        self.realized_lamports = 0
+
+    # ---------------- MARKET DATA ----------------
+    def set_price(self, mint, price_usd):
+        self.prices[mint] = float(price_usd)
+
+    def set_reserves(self, mint, sol_lamports, token_amount):
+        self.reserves[mint] = [int(sol_lamports), int(token_amount)]
+
+    # ---------------- SWAPS ----------------
+    async def swap(self, input_mint, output_mint, amount):
+        """Returns {"signature", "out_amount", "price"} or None when the fill fails"""
+        if self.latency_ms or self.latency_jitter_ms:
+            await asyncio.sleep((self.latency_ms + self.rng.uniform(0, self.latency_jitter_ms)) / 1000)
+
+        is_buy = input_mint == SOL_MINT
+        mint = output_mint if is_buy else input_mint
+        amount = int(amount)
+        if amount <= 0 or self.balances.get(input_mint, 0) < amount or self.rng.random() < self.fail_rate:
+            self.failed += 1
+            return None
+
+        out = await self._ideal_out(mint, is_buy, amount)
+        if not out:
+            self.failed += 1
+            return None
+        slip = (self.slippage_bps + self.rng.uniform(0, self.slippage_jitter_bps)) / 10_000
+        out = int(out * (1 - slip))
+
+        self._move(mint, is_buy, amount, out)
+        self.trades += 1
+        return {"signature": f"PAPER-{next(self._ids)}", "out_amount": out, "price": self.prices.get(mint, 0)}
+
+    async def _ideal_out(self, mint, is_buy, amount):
+        pool = self.reserves.get(mint)
+        if pool:
+            sol, tokens = pool
+            amount_in = amount * (1 - POOL_FEE)
+            if is_buy:
+                return tokens * amount_in / (sol + amount_in)
+            return sol * amount_in / (tokens + amount_in)
+
+        if mint in self.prices:
+            # tokens per lamport from USD prices
+            scale = 10 ** self.decimals.get(mint, TOKEN_DECIMALS) / 1_000_000_000
+            rate = self.prices[SOL_MINT] / self.prices[mint] * scale
+            return amount * rate if is_buy else amount / rate
+
+        if self.data:
+            quote = await self.data.get_quote(SOL_MINT if is_buy else mint, mint if is_buy else SOL_MINT, amount)
+            if quote:
+                return int(quote.get('outAmount', 0))
+        return None
+
+    def _move(self, mint, is_buy, amount, out):
+        if is_buy:
+            self.balances[SOL_MINT] -= amount
+            self.balances[mint] = self.balances.get(mint, 0) + out
+            self.cost_basis[mint] = self.cost_basis.get(mint, 0) + amount
+            if mint in self.reserves:
+                self.reserves[mint][0] += amount
+                self.reserves[mint][1] -= out
+        else:
+            held = self.balances[mint]
+            cost = self.cost_basis.get(mint, 0) * amount // held
+            self.balances[mint] = held - amount
+            self.cost_basis[mint] = self.cost_basis.get(mint, 0) - cost
+            self.balances[SOL_MINT] += out
+            self.realized_lamports += out - cost
+            if not self.balances[mint]:
+                del self.balances[mint]
+                self.cost_basis.pop(mint, None)
+            if mint in self.reserves:
+                self.reserves[mint][0] -= out
+                self.reserves[mint][1] += amount
+
+    def checkpoint_state(self):
+        return {
+            "balances": self.balances,
+            "cost_basis": self.cost_basis,
+            "start_lamports": self.start_lamports,
+            "realized_lamports": self.realized_lamports,
+            "trades": self.trades,
+            "failed": self.failed
+        }
+
+    async def restore_state(self, state):
+        for key, value in state.items():
+            setattr(self, key, value)
+        self._ids = itertools.count(self.trades + 1)
+
+    # ---------------- REPORTING ----------------
+    def get_balance_sol(self):
+        return self.balances[SOL_MINT] / 1_000_000_000
+
+    def summary(self):
+        """Balances and PnL in SOL, open tokens valued at the last known price"""
+        open_value = 0
+        for mint, amount in self.balances.items():
+            if mint == SOL_MINT or mint not in self.prices: continue
+            scale = 10 ** self.decimals.get(mint, TOKEN_DECIMALS)
+            open_value += amount / scale * self.prices[mint] / self.prices[SOL_MINT]
+        sol = self.get_balance_sol()
+        return {
+            "trades": self.trades,
+            "failed": self.failed,
+            "balance_sol": round(sol, 4),
+            "open_positions": len(self.balances) - 1,
+            "open_value_sol": round(open_value, 4),
+            "realized_pnl_sol": round(self.realized_lamports / 1_000_000_000, 4),
+            "total_pnl_sol": round(sol + open_value - self.start_lamports / 1_000_000_000, 4),
+        }
+
+
+# ---------------- REPLAY ----------------
+def random_walk_ticks(n_ticks, n_tokens=200, seed=3):
+    """Fake market data: (mint, price) with a random walk per token"""
+    rng = random.Random(seed)
+    prices = {f"Paper{i:04d}" + "1" * 35: rng.uniform(0.0001, 1) for i in range(n_tokens)}
+    mints = list(prices)
+    for _ in range(n_ticks):
+        mint = rng.choice(mints)
+        prices[mint] *= 1 + rng.gauss(0.001, 0.04)
+        yield mint, prices[mint]
+
+
+def load_ticks(path):
+    """JSON lines of {"mint": ..., "price": ...} (e.g. recorded from DataEngine.get_prices)"""
+    with open(path, 'r') as f:
+        for line in f:
+            if line.strip():
+                tick = json.loads(line)
+                yield tick['mint'], float(tick['price'])
+
+
+async def replay(trader, exchange, ticks, buy_amount_sol):
+    """Feeds ticks through AutoTrader: first sight of a mint is the entry signal,
+    exits come from the real ExitEngine + sell_position path"""
+    from auto_engine import SOL_MINT as TRADER_SOL_MINT
+    bought = set()
+    n = 0
+    start = time.perf_counter()
+    for mint, price in ticks:
+        n += 1
+        exchange.set_price(mint, price)
+        if mint not in bought:
+            bought.add(mint)
+            await trader.execute_swap(TRADER_SOL_MINT, mint, buy_amount_sol * 1_000_000_000,
+                                      info={"symbol": mint[:9], "price": price})
+            continue
+        orders = trader.exits.on_price(mint, price)
+        if orders:
+            await trader.exits.execute(orders, trader.sell_position)
+    elapsed = time.perf_counter() - start
+    return {"ticks": n, "seconds": round(elapsed, 3), "ticks_per_sec": round(n / elapsed) if elapsed else 0,
+            "trades_per_sec": round(exchange.trades / elapsed) if elapsed else 0}
+
+
+async def _main(args):
+    from auto_engine import AutoTrader
+    from tracker import TradeTracker
+
+    exchange = PaperExchange(balance_sol=args.balance, slippage_bps=args.slippage_bps,
+                             slippage_jitter_bps=args.slippage_jitter_bps, latency_ms=args.latency_ms,
+                             fail_rate=args.fail_rate, seed=1)
+    trader = AutoTrader(None, None, None, TradeTracker(None), None)
+    trader.paper = exchange
+    ticks = load_ticks(args.ticks_file) if args.ticks_file else random_walk_ticks(args.ticks, args.tokens)
+
+    stats = await replay(trader, exchange, ticks, args.buy)
+    print(f"\n⚡ {stats['ticks']} ticks in {stats['seconds']}s ({stats['ticks_per_sec']}/s), "
+          f"{exchange.trades} trades ({stats['trades_per_sec']}/s)")
+    for key, value in exchange.summary().items():
+        print(f"• {key}: {value}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Replay market data through the strategy with paper fills")
+    parser.add_argument("--ticks", type=int, default=100_000, help="random-walk ticks when no --ticks-file")
+    parser.add_argument("--tokens", type=int, default=200)
+    parser.add_argument("--ticks-file", help="JSON lines of {mint, price}")
+    parser.add_argument("--balance", type=float, default=1000, help="starting SOL")
+    parser.add_argument("--buy", type=float, default=0.02, help="SOL per entry")
+    parser.add_argument("--slippage-bps", type=float, default=50)
+    parser.add_argument("--slippage-jitter-bps", type=float, default=50)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    asyncio.run(_main(parser.parse_args()))
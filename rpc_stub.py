@@ -0,0 +1,124 @@
+#Local stand-in for the Solana RPC and RugCheck, so safety checks can run offline
+import asyncio
+from aiohttp import web
+
+# Default fixtures: one safe token, one with live authorities and whale holders
+SAFE_MINT = "SafeMint111111111111111111111111111111111111"
+RISKY_MINT = "RiskyMint11111111111111111111111111111111111"
+
+MINT_ACCOUNTS = {
+    SAFE_MINT: {"supply": "1000000000000", "decimals": 6, "mintAuthority": None, "freezeAuthority": None},
+    RISKY_MINT: {"supply": "1000000000000", "decimals": 6,
+                 "mintAuthority": "Dev1111111111111111111111111111111111111111",
+                 "freezeAuthority": "Dev1111111111111111111111111111111111111111"},
+}
+# Holders are amounts (a wallet owns the account) or {"amount", "owner"}
+WALLET_OWNER = "GmaDrppBC7P5ARKV8g3djiwP89vz1jLK23V2GBjuAEGB" # on the ed25519 curve, like any wallet
+POOL_OWNER = "7cogN2h8NCWHcfPdWvpo5FMg61jefi8LLwHop3fk3p9y" # a PDA, like an AMM vault or pump.fun curve
+LARGEST_ACCOUNTS = {
+    SAFE_MINT: [{"amount": "600000000000", "owner": POOL_OWNER}] + ["20000000000"] * 10, # 60% in the pool, wallets 20%
+    RISKY_MINT: ["80000000000"] * 10, # top 10 own 80%
+}
+RUGCHECK_REPORTS = {
+    SAFE_MINT: {"score": 5, "risks": []},
+    RISKY_MINT: {"score": 45, "risks": [{"name": "Low Liquidity"}]},
+}
+
+
+class RpcStub:
+    """Serves getAccountInfo / getTokenLargestAccounts / getMultipleAccounts on POST / and
+    RugCheck reports on GET /v1/tokens/{mint}/report.
+    Point SafetyChecker at it with rpc_url=stub.url and rugcheck_api=stub.rugcheck_api"""
+
+    def __init__(self, mints=None, holders=None, reports=None, port=0):
+        self.mints = dict(MINT_ACCOUNTS if mints is None else mints)
+        self.holders = dict(LARGEST_ACCOUNTS if holders is None else holders)
+        self.reports = dict(RUGCHECK_REPORTS if reports is None else reports)
+        self.port = port
+        self.calls = [] # (method, mint) of every request, to check what was skipped
+        self.runner = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}/"
+
+    @property
+    def rugcheck_api(self):
+        return f"http://127.0.0.1:{self.port}/v1/tokens/"
+
+    def make_app(self):
+        app = web.Application()
+        app.router.add_post("/", self.handle_rpc)
+        app.router.add_get("/v1/tokens/{mint}/report", self.handle_rugcheck)
+        return app
+
+    async def start(self):
+        self.runner = web.AppRunner(self.make_app(), access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self.runner:
+            await self.runner.cleanup()
+
+    async def handle_rpc(self, request):
+        body = await request.json()
+        method, params = body.get("method"), body.get("params", [])
+        mint = params[0] if params else None
+        self.calls.append((method, mint))
+
+        if method == "getAccountInfo":
+            info = self.mints.get(mint)
+            value = {"data": {"parsed": {"type": "mint", "info": info}}} if info else None
+        elif method == "getTokenLargestAccounts":
+            value = [{"address": f"{mint[:8]}Acct{i}", "amount": h["amount"] if isinstance(h, dict) else h}
+                     for i, h in enumerate(self.holders.get(mint, []))]
+        elif method == "getMultipleAccounts":
+            value = [self._token_account(address) for address in mint]
+        else:
+            return web.json_response({"jsonrpc": "2.0", "id": body.get("id"),
+                                      "error": {"code": -32601, "message": "Method not found"}})
+        return web.json_response({"jsonrpc": "2.0", "id": body.get("id"),
+                                  "result": {"context": {"slot": 1}, "value": value}})
+
+    def _token_account(self, address):
+        mint, _, i = address.rpartition("Acct")
+        for m, holders in self.holders.items():
+            if m[:8] == mint and i.isdigit() and int(i) < len(holders):
+                h = holders[int(i)]
+                owner = h.get("owner", WALLET_OWNER) if isinstance(h, dict) else WALLET_OWNER
+                return {"data": {"parsed": {"type": "account", "info": {"mint": m, "owner": owner}}}}
+        return None
+
+    async def handle_rugcheck(self, request):
+        mint = request.match_info["mint"]
+        self.calls.append(("rugcheck", mint))
+        report = self.reports.get(mint)
+        if report is None:
+            return web.json_response({"error": "not found"}, status=404)
+        return web.json_response(report)
+
+
+async def _demo():
+    import os
+    import tempfile
+    from safety import SafetyChecker
+
+    stub = await RpcStub().start()
+    filename = os.path.join(tempfile.mkdtemp(), "safety.json")
+    checker = SafetyChecker(filename, rpc_url=stub.url, rugcheck_api=stub.rugcheck_api)
+    try:
+        for mint in (SAFE_MINT, RISKY_MINT):
+            print(mint, await checker.check(mint))
+        calls = len(stub.calls)
+        await checker.check(SAFE_MINT)
+        print(f"✅ Repeat scan made {len(stub.calls) - calls} requests")
+    finally:
+        await stub.stop()
+
+
+if __name__ == '__main__':
+    asyncio.run(_demo())
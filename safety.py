@@ -0,0 +1,200 @@
+import asyncio
+import json
+import os
+import socket
+import time
+import aiohttp
+from dotenv import load_dotenv
+from solders.pubkey import Pubkey
+
+load_dotenv()
+
+#Settings
+SOLANA_RPC_URL = os.getenv("SOLANA_RPC_URL", "https://api.mainnet-beta.solana.com")
+RUGCHECK_API = "https://api.rugcheck.xyz/v1/tokens/"
+HOLDERS_TTL = 30 * 60 # holder concentration moves, re-check after 30 min
+RESULTS_TTL = 7 * 24 * 3600 # results older than this are dropped when the file is written
+
+# Risk points added by the on-chain checks (same 0-100 scale as RugCheck, higher = riskier)
+MINT_AUTHORITY_RISK = 40
+FREEZE_AUTHORITY_RISK = 30
+TOP10_HIGH_PCT, TOP10_HIGH_RISK = 50, 25
+TOP10_MED_PCT, TOP10_MED_RISK = 30, 10
+
+
+class SafetyChecker:
+    """RugCheck + on-chain checks (mint/freeze authority, top holders) run in parallel.
+    Results are kept per mint so repeat scans skip the network, and written to disk
+    with save_results() (from the checkpoint tick), not on every scan."""
+
+    def __init__(self, filename="safety.json", rpc_url=SOLANA_RPC_URL, rugcheck_api=RUGCHECK_API):
+        self.filename = filename
+        self.rpc_url = rpc_url
+        self.rugcheck_api = rugcheck_api
+        self.results = self._load_results()
+        self.dirty = False
+
+    def _load_results(self):
+        if not os.path.exists(self.filename):
+            return {}
+        try:
+            with open(self.filename, 'r') as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def save_results(self):
+        if not self.dirty: return
+        cutoff = time.time() - RESULTS_TTL
+        self.results = {mint: r for mint, r in self.results.items() if r.get("checked_at", 0) > cutoff}
+        tmp = self.filename + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump(self.results, f)
+        os.replace(tmp, self.filename)
+        self.dirty = False
+
+    def get_cached(self, token_address):
+        """Returns the saved result if it is still fresh, else None"""
+        cached = self.results.get(token_address)
+        if cached and time.time() - cached.get("checked_at", 0) < HOLDERS_TTL:
+            return cached
+        return None
+
+    async def check(self, token_address):
+        cached = self.results.get(token_address)
+        if self.get_cached(token_address):
+            return cached
+
+        # Revoked authorities can never come back and then the supply only shrinks by burns,
+        # so a stale result still answers getAccountInfo for us
+        mint_info = None
+        if cached and cached.get("supply") and not cached.get("mint_authority") and not cached.get("freeze_authority"):
+            mint_info = {"data": {"parsed": {"info": {"supply": cached["supply"]}}}}
+
+        conn = aiohttp.TCPConnector(family=socket.AF_INET, ssl=False)
+        async with aiohttp.ClientSession(connector=conn) as session:
+            checks = [
+                self._rugcheck(session, token_address),
+                self._rpc(session, "getTokenLargestAccounts", [token_address])
+            ]
+            if mint_info is None:
+                checks.append(self._rpc(session, "getAccountInfo", [token_address, {"encoding": "jsonParsed"}]))
+            rugcheck, holders, *fetched = await asyncio.gather(*checks, return_exceptions=True)
+            if isinstance(holders, list):
+                holders = await self._wallet_holders(session, holders)
+        if fetched:
+            mint_info = fetched[0]
+
+        result = self._merge(rugcheck, mint_info, holders)
+        if result["score"] != "Unknown":
+            self.results[token_address] = result
+            self.dirty = True
+        return result
+
+    async def _rugcheck(self, session, token_address):
+        async with session.get(f"{self.rugcheck_api}{token_address}/report") as response:
+            if response.status != 200: return None
+            data = await response.json()
+            return {
+                "score": data.get('score', 0),
+                "risks": [risk['name'] for risk in data.get('risks', [])]
+            }
+
+    async def _rpc(self, session, method, params):
+        payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+        async with session.post(self.rpc_url, json=payload) as response:
+            if response.status != 200: return None
+            data = await response.json()
+            return (data.get('result') or {}).get('value')
+
+    async def _wallet_holders(self, session, holders):
+        """Drops pool vaults, bonding curves and other program-owned accounts from the largest holders.
+        Those are owned by program-derived addresses (off the ed25519 curve), real wallets are on it.
+        Multisig treasuries are PDAs too, so they are left out of the concentration as well."""
+        addresses = [h['address'] for h in holders if h.get('address')]
+        if not addresses:
+            return holders
+        try:
+            accounts = await self._rpc(session, "getMultipleAccounts", [addresses, {"encoding": "jsonParsed"}])
+        except Exception as e:
+            print(f"⚠️ Holder owner lookup failed, top 10 includes liquidity accounts: {e}")
+            return holders
+        if not isinstance(accounts, list):
+            return holders
+
+        owners = {}
+        for address, account in zip(addresses, accounts):
+            owner = (_parsed_mint(account) or {}).get('owner')
+            if owner:
+                owners[address] = owner
+        wallets = []
+        for h in holders:
+            owner = owners.get(h.get('address'))
+            if owner and not Pubkey.from_string(owner).is_on_curve():
+                continue
+            wallets.append(h)
+        return wallets
+
+    def _merge(self, rugcheck, mint_info, holders):
+        score = None
+        risks = []
+        sources = []
+
+        if isinstance(rugcheck, dict):
+            score = min(int(rugcheck['score']), 100)
+            risks.extend(rugcheck['risks'])
+            sources.append("rugcheck")
+        else:
+            print(f"⚠️ RugCheck Error: {rugcheck}")
+
+        mint_authority = freeze_authority = None
+        supply = 0
+        top_10_percentage = 0
+        onchain_score = 0
+        info = _parsed_mint(mint_info)
+        if info:
+            sources.append("rpc")
+            mint_authority = info.get('mintAuthority')
+            freeze_authority = info.get('freezeAuthority')
+            if mint_authority:
+                onchain_score += MINT_AUTHORITY_RISK
+                risks.append("Mint Authority still enabled")
+            if freeze_authority:
+                onchain_score += FREEZE_AUTHORITY_RISK
+                risks.append("Freeze Authority still enabled")
+
+            supply = int(info.get('supply', 0))
+            if isinstance(holders, list) and supply > 0:
+                # pools and bonding curves are already filtered out (see _wallet_holders)
+                top_10 = sum(int(h.get('amount', 0)) for h in holders[:10])
+                top_10_percentage = round(top_10 / supply * 100, 1)
+                if top_10_percentage > TOP10_HIGH_PCT:
+                    onchain_score += TOP10_HIGH_RISK
+                    risks.append(f"Top 10 holders own {top_10_percentage}%")
+                elif top_10_percentage > TOP10_MED_PCT:
+                    onchain_score += TOP10_MED_RISK
+
+        if sources == ["rpc"]:
+            score = min(onchain_score, 100)
+        elif score is not None:
+            # RugCheck already weighs authorities, only let on-chain data make it worse
+            score = max(score, min(onchain_score, 100))
+
+        return {
+            "score": score if score is not None else "Unknown",
+            "risks": list(dict.fromkeys(risks)),
+            "mint_authority": mint_authority,
+            "freeze_authority": freeze_authority,
+            "top_10_percentage": top_10_percentage,
+            "supply": supply,
+            "sources": sources,
+            "checked_at": time.time()
+        }
+
+
+def _parsed_mint(account):
+    #getAccountInfo jsonParsed -> {"data": {"parsed": {"info": {...}}}} (mint or token account)
+    if not isinstance(account, dict): return None
+    data = account.get('data')
+    if not isinstance(data, dict): return None
+    return data.get('parsed', {}).get('info')
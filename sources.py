@@ -0,0 +1,171 @@
+#Candidate sources for the Hunter: each one declares its cost and freshness,
+#and the poller speeds up the ones that keep finding new tokens and backs off the stale ones.
+import asyncio
+import logging
+import time
+import aiohttp
+
+#Settings
+HUNT_BUDGET = 5 # max total source cost spent per hunt
+MAX_BACKOFF = 8 # a stale source is polled at most every freshness * MAX_BACKOFF seconds
+KNOWN_TTL = 6 * 3600 # how long an address counts as "already seen" for a source
+COIN_TTL = 6 * 3600
+COIN_MISS_TTL = 3600 # retry coins without a Solana contract sooner
+
+
+class CandidateSource:
+    """fetch: async () -> [{"address", "source", ...}]
+    cost: request weight (1 = one cheap API call)
+    freshness: seconds its results stay useful, also the fastest it is polled
+    priority: lower comes first when candidates are combined"""
+
+    def __init__(self, name, fetch, cost=1, freshness=60, priority=0):
+        self.name = name
+        self.fetch = fetch
+        self.cost = cost
+        self.freshness = freshness
+        self.priority = priority
+        self.interval = freshness
+        self.next_due = 0
+        self.last_candidates = []
+        self.known = {} # address -> last time this source returned it
+        self.polls = 0
+        self.new_found = 0
+
+    def is_due(self, now):
+        return now >= self.next_due
+
+    def update(self, candidates, now):
+        """Records a poll and adapts the interval to how many new valid candidates it gave"""
+        valid = [c for c in candidates if c.get('address')]
+        new = [c for c in valid if c['address'] not in self.known]
+        for c in valid:
+            self.known[c['address']] = now
+        cutoff = now - KNOWN_TTL
+        self.known = {a: ts for a, ts in self.known.items() if ts > cutoff}
+
+        if new:
+            self.interval = max(self.freshness, self.interval / 2)
+        else:
+            self.interval = min(self.freshness * MAX_BACKOFF, self.interval * 2)
+        self.next_due = now + self.interval
+        self.last_candidates = valid
+        self.polls += 1
+        self.new_found += len(new)
+        return new
+
+    def checkpoint_state(self):
+        return {"interval": self.interval, "next_due": self.next_due, "known": self.known}
+
+    def restore_state(self, state):
+        self.interval = state.get("interval", self.freshness)
+        self.next_due = state.get("next_due", 0)
+        self.known.update(state.get("known", {}))
+
+
+class SourceRegistry:
+    def __init__(self, budget=HUNT_BUDGET):
+        self.sources = {}
+        self.budget = budget
+
+    def register(self, source):
+        self.sources[source.name] = source
+        return source
+
+    async def collect(self, force=False):
+        """Polls the due sources (in priority order, within budget) at the same time,
+        reuses the last results of the others, and returns everything in priority order"""
+        now = time.time()
+        ordered = sorted(self.sources.values(), key=lambda s: s.priority)
+        due, spent = [], 0
+        for source in ordered:
+            if (force or source.is_due(now)) and spent + source.cost <= self.budget:
+                due.append(source)
+                spent += source.cost
+
+        results = await asyncio.gather(*(s.fetch() for s in due), return_exceptions=True)
+        for source, result in zip(due, results):
+            if isinstance(result, Exception):
+                logging.error(f"Source Error ({source.name}): {result}")
+                result = []
+            new = source.update(result, now)
+            print(f"📡 {source.name}: {len(result)} candidates, {len(new)} new, next poll in {source.interval:.0f}s")
+
+        candidates = []
+        for source in ordered:
+            candidates.extend(source.last_candidates)
+        return candidates
+
+    def next_due(self):
+        """When the earliest source wants polling again (0 if none are registered)"""
+        return min((s.next_due for s in self.sources.values()), default=0)
+
+    def get_stats(self):
+        return {
+            name: {"interval": round(s.interval), "polls": s.polls, "new_found": s.new_found}
+            for name, s in self.sources.items()
+        }
+
+    def checkpoint_state(self):
+        return {name: s.checkpoint_state() for name, s in self.sources.items()}
+
+    def restore_state(self, state):
+        for name, source_state in (state or {}).items():
+            if name in self.sources:
+                self.sources[name].restore_state(source_state)
+
+
+class CoinIndex:
+    """CoinGecko coin id -> Solana mint, from the coin's own contract data (platforms.solana).
+    Tickers are reused by copycat tokens all the time, so they are never used to pick a mint.
+    Results are cached (misses too)."""
+
+    def __init__(self, coins_api="https://api.coingecko.com/api/v3/coins/"):
+        self.coins_api = coins_api
+        self.entries = {} # coin id -> [mint or None, resolved_at]
+
+    def get(self, coin_id):
+        entry = self.entries.get(coin_id)
+        if not entry: return None, False
+        mint, resolved_at = entry
+        ttl = COIN_TTL if mint else COIN_MISS_TTL
+        return mint, time.time() - resolved_at < ttl
+
+    async def resolve(self, coin_ids):
+        """Returns {coin id: mint} for the coins that have a Solana contract"""
+        resolved, missing = {}, []
+        for coin_id in dict.fromkeys(coin_ids):
+            mint, fresh = self.get(coin_id)
+            if fresh:
+                if mint: resolved[coin_id] = mint
+            else:
+                missing.append(coin_id)
+
+        if missing:
+            async with aiohttp.ClientSession() as session:
+                mints = await asyncio.gather(*(self._lookup(session, c) for c in missing), return_exceptions=True)
+            now = time.time()
+            for coin_id, mint in zip(missing, mints):
+                if isinstance(mint, Exception):
+                    logging.error(f"Coin lookup failed ({coin_id}): {mint}")
+                    continue # network error or rate limit, don't cache
+                self.entries[coin_id] = [mint, now]
+                if mint: resolved[coin_id] = mint
+        return resolved
+
+    async def _lookup(self, session, coin_id):
+        params = {"localization": "false", "tickers": "false", "market_data": "false",
+                  "community_data": "false", "developer_data": "false"}
+        async with session.get(self.coins_api + coin_id, params=params) as response:
+            if response.status == 404:
+                return None
+            if response.status != 200:
+                raise RuntimeError(f"coins returned {response.status}")
+            data = await response.json()
+        return (data.get('platforms') or {}).get('solana') or None
+
+    def checkpoint_state(self):
+        return self.entries
+
+    def restore_state(self, state):
+        self.entries.update(state or {})
@@ -8,16 +8,16 @@ class TradeTracker:
         self.positions =self._load_positions()
     
     def _load_positions(self):
-        if not os.path.exists(self.filename):
-            if not os.path.exists(self.filename):
-                return{}
-            try:
-                with open(self.filename, 'r') as f:
-                    return json.load(f)
-            except:
-                return{}
+        if not self.filename or not os.path.exists(self.filename):
+            return{}
+        try:
+            with open(self.filename, 'r') as f:
+                return json.load(f)
+        except:
+            return{}
             
     def save_positions(self):
+        if not self.filename: return # in-memory only (paper replays)
         with open(self.filename, 'w') as f:
             json.dump(self.positions, f, indent=4)
 
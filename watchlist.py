@@ -0,0 +1,253 @@
+import asyncio
+import itertools
+import json
+import logging
+import math
+import os
+import time
+from bisect import bisect_left, bisect_right, insort
+
+#Settings
+WATCH_INTERVAL = 15 #seconds between polls of all watched mints
+MAX_ALERTS_PER_CHAT = 200
+SEND_RATE = 25 #messages per second, Telegram allows about 30
+MAX_SEND_TRIES = 3 #rounds a fired alert is retried before it is given up
+
+# /watch name -> snapshot field (see DataEngine.get_snapshots)
+METRICS = {
+    "price": "price",
+    "liq": "liquidity",
+    "vol": "volume_24h",
+    "mcap": "market_cap",
+}
+ABOVE, BELOW = "above", "below"
+INF = float("inf")
+
+
+class Alert:
+    __slots__ = ("alert_id", "chat_id", "mint", "metric", "direction", "threshold", "created")
+
+    def __init__(self, alert_id, chat_id, mint, metric, direction, threshold, created=None):
+        self.alert_id = alert_id
+        self.chat_id = chat_id
+        self.mint = mint
+        self.metric = metric
+        self.direction = direction
+        self.threshold = float(threshold)
+        self.created = created or time.time()
+
+    def describe(self):
+        name = next(k for k, v in METRICS.items() if v == self.metric)
+        value = f"${self.threshold:,.8g}" if self.metric == "price" else f"${self.threshold:,.0f}"
+        return f"#{self.alert_id} {name} {self.direction} {value}"
+
+
+class ThresholdIndex:
+    """Sorted thresholds for one (mint, metric).
+    above: fires when value >= threshold -> always a prefix of the list
+    below: fires when value <= threshold -> always a suffix of the list"""
+    __slots__ = ("above", "below")
+
+    def __init__(self):
+        self.above = [] # (threshold, alert_id) ascending
+        self.below = []
+
+    def add(self, alert):
+        insort(self.above if alert.direction == ABOVE else self.below, (alert.threshold, alert.alert_id))
+
+    def remove(self, alert):
+        levels = self.above if alert.direction == ABOVE else self.below
+        key = (alert.threshold, alert.alert_id)
+        i = bisect_left(levels, key)
+        if i < len(levels) and levels[i] == key:
+            del levels[i]
+
+    def fire(self, value):
+        """Pops and returns the ids of every alert the value crosses"""
+        fired = []
+        i = bisect_right(self.above, (value, INF))
+        if i:
+            fired.extend(alert_id for _, alert_id in self.above[:i])
+            del self.above[:i]
+        j = bisect_left(self.below, (value, -INF))
+        if j < len(self.below):
+            fired.extend(alert_id for _, alert_id in self.below[j:])
+            del self.below[j:]
+        return fired
+
+    def __len__(self):
+        return len(self.above) + len(self.below)
+
+
+class Watchlist:
+    def __init__(self, data_engine, filename="watchlist.json"):
+        self.data = data_engine
+        self.filename = filename
+        self.alerts = {}  # alert_id -> Alert
+        self.index = {}   # mint -> {metric: ThresholdIndex}
+        self.by_chat = {} # chat_id -> set of alert_ids
+        self.outbox = []  # [alert, value, tries] fired but not delivered yet
+        self._ids = itertools.count(1)
+        self._load_alerts()
+
+    # ---------------- PERSISTENCE ----------------
+    def _load_alerts(self):
+        if not os.path.exists(self.filename):
+            return
+        try:
+            with open(self.filename, 'r') as f:
+                rows = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Could not load watchlist: {e}")
+            return
+        for row in rows:
+            self._insert(Alert(*row))
+        self._ids = itertools.count(max(self.alerts, default=0) + 1)
+
+    def save_alerts(self):
+        rows = [[a.alert_id, a.chat_id, a.mint, a.metric, a.direction, a.threshold, a.created]
+                for a in self.alerts.values()]
+        with open(self.filename, 'w') as f:
+            json.dump(rows, f)
+
+    # ---------------- RULES ----------------
+    def add_alert(self, chat_id, mint, metric, direction, threshold):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric '{metric}'. Use: {', '.join(METRICS)}")
+        if direction not in (ABOVE, BELOW):
+            raise ValueError("Direction must be 'above' or 'below'")
+        if not is_valid_mint(mint):
+            raise ValueError("That doesn't look like a token address")
+        if not math.isfinite(threshold):
+            raise ValueError("Threshold must be a number")
+        if len(self.by_chat.get(chat_id, ())) >= MAX_ALERTS_PER_CHAT:
+            raise ValueError(f"Limit of {MAX_ALERTS_PER_CHAT} alerts reached")
+        alert = Alert(next(self._ids), chat_id, mint, METRICS[metric], direction, threshold)
+        self._insert(alert)
+        self.save_alerts()
+        return alert
+
+    def remove_alert(self, chat_id, alert_id):
+        alert = self.alerts.get(alert_id)
+        if alert is None or alert.chat_id != chat_id:
+            return False
+        self.index[alert.mint][alert.metric].remove(alert)
+        self._drop(alert)
+        self.save_alerts()
+        return True
+
+    def remove_mint(self, chat_id, mint):
+        ids = [a for a in self.by_chat.get(chat_id, ()) if self.alerts[a].mint == mint]
+        for alert_id in ids:
+            alert = self.alerts[alert_id]
+            self.index[alert.mint][alert.metric].remove(alert)
+            self._drop(alert)
+        if ids:
+            self.save_alerts()
+        return len(ids)
+
+    def get_alerts(self, chat_id):
+        return sorted((self.alerts[a] for a in self.by_chat.get(chat_id, ())), key=lambda a: a.alert_id)
+
+    def mints(self):
+        return list(self.index)
+
+    # ---------------- EVALUATION ----------------
+    def on_snapshots(self, snapshots):
+        """Takes {mint: snapshot} and returns (alert, value) for every alert that fired.
+        Only the crossed end of each sorted index is touched."""
+        fired = []
+        for mint, snap in snapshots.items():
+            metrics = self.index.get(mint)
+            if not metrics: continue
+            for metric, levels in list(metrics.items()):
+                value = snap.get(metric)
+                if value is None: continue
+                for alert_id in levels.fire(value):
+                    alert = self.alerts[alert_id]
+                    self._drop(alert)
+                    fired.append((alert, value))
+        if fired:
+            self.save_alerts()
+        return fired
+
+    async def poll(self):
+        mints = self.mints()
+        if not mints: return []
+        snapshots = await self.data.get_snapshots(mints)
+        return self.on_snapshots(snapshots)
+
+    async def run(self, send_fn, interval=WATCH_INTERVAL):
+        """Polls every watched mint in shared batches and calls send_fn(chat_id, text) per fired alert"""
+        while True:
+            try:
+                self.outbox.extend([alert, value, 0] for alert, value in await self.poll())
+            except Exception as e:
+                logging.error(f"Watchlist Error: {e}")
+            await self.flush(send_fn)
+            await asyncio.sleep(interval)
+
+    async def flush(self, send_fn):
+        """Sends fired alerts at most SEND_RATE per second. A failed send stays queued for the next round."""
+        outbox, self.outbox = self.outbox, []
+        for i, item in enumerate(outbox):
+            alert, value, tries = item
+            if i:
+                await asyncio.sleep(1 / SEND_RATE)
+            try:
+                await send_fn(alert.chat_id, format_alert(alert, value))
+            except Exception as e:
+                item[2] = tries + 1
+                if item[2] < MAX_SEND_TRIES:
+                    self.outbox.append(item)
+                    logging.error(f"Alert Send Error (#{alert.alert_id}, chat {alert.chat_id}): {e}")
+                else:
+                    logging.error(f"Alert #{alert.alert_id} dropped after {item[2]} failed sends: {e}")
+
+    # ---------------- INTERNALS ----------------
+    def _insert(self, alert):
+        self.alerts[alert.alert_id] = alert
+        self.index.setdefault(alert.mint, {}).setdefault(alert.metric, ThresholdIndex()).add(alert)
+        self.by_chat.setdefault(alert.chat_id, set()).add(alert.alert_id)
+
+    def _drop(self, alert):
+        #forget an alert that is already out of its ThresholdIndex
+        del self.alerts[alert.alert_id]
+        chat_alerts = self.by_chat[alert.chat_id]
+        chat_alerts.discard(alert.alert_id)
+        if not chat_alerts:
+            del self.by_chat[alert.chat_id]
+        metrics = self.index.get(alert.mint)
+        if metrics is None: return
+        levels = metrics.get(alert.metric)
+        if levels is not None and not levels:
+            del metrics[alert.metric]
+        if not metrics:
+            del self.index[alert.mint]
+
+
+def parse_amount(text):
+    """'0.0012', '50k', '1.5m' -> float"""
+    text = text.lower().replace("$", "").replace(",", "")
+    scale = {"k": 1e3, "m": 1e6, "b": 1e9}.get(text[-1:], 1)
+    if scale != 1:
+        text = text[:-1]
+    value = float(text) * scale
+    if not math.isfinite(value):
+        # nan/inf would break the sorted threshold indexes
+        raise ValueError(f"'{text}' is not a valid amount")
+    return value
+
+
+def is_valid_mint(mint):
+    """Same check handle_message uses for a pasted CA; mints are joined with commas in DexScreener URLs"""
+    return 30 < len(mint) < 50 and not any(c.isspace() or c in ",/?#" for c in mint)
+
+
+def format_alert(alert, value):
+    shown = f"${value:,.8g}" if alert.metric == "price" else f"${value:,.0f}"
+    return (
+        f"🔔 **Watch Alert** {alert.describe()}\n"
+        f"`{alert.mint}`\n"
+        f"Now: {shown}"
+    )